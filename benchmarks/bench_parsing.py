@@ -0,0 +1,87 @@
+"""Micro-benchmark da conversão das colunas numéricas e de datas.
+
+Compara as conversões antigas, célula a célula (``apply(convert_to_float)`` e
+``apply(lambda x: x.replace(year=year))``), com ``engine.parsing.to_numeric_br``
+e ``engine.parsing.parse_sheet_dates`` em colunas de tamanhos crescentes:
+
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --linhas 100000 500000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from engine.parsing import parse_sheet_dates, to_numeric_br
+
+
+# Conversão usada antes do engine, mantida aqui apenas como referência
+def convert_to_float(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, str):
+        value = value.replace('R$', '').replace(' ', '').replace(',', '.')
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# Conversão de datas usada antes do engine, também mantida como referência
+def convert_dates(series, date_format, year):
+    dates = pd.to_datetime(series, format=date_format, errors='coerce')
+    return dates.apply(lambda x: x.replace(year=year) if pd.notnull(x) else x)
+
+
+def sample_column(rows, seed=0):
+    rnd = random.Random(seed)
+    formats = [
+        lambda v: f"{v:.2f}".replace('.', ','),
+        lambda v: f"{v:.3f}".replace('.', ','),
+        lambda v: f"R$ {v:.2f}".replace('.', ','),
+        lambda v: f"{v:.2f}",
+    ]
+    return pd.Series([rnd.choice(formats)(rnd.uniform(-50, 50)) for _ in range(rows)], dtype=object)
+
+
+def sample_dates(rows, seed=0):
+    rnd = random.Random(seed)
+    return pd.Series([f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/24" for _ in range(rows)], dtype=object)
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("Números", sample_column,
+         lambda column: column.apply(convert_to_float),
+         to_numeric_br),
+        ("Datas", sample_dates,
+         lambda column: convert_dates(column, '%d/%m/%y', 2024),
+         lambda column: parse_sheet_dates(column, '%d/%m/%y', 2024)),
+    ]
+    for title, sample, legacy_func, vectorized_func in cases:
+        print(title)
+        print(f"{'linhas':>10} {'apply (µs/linha)':>18} {'vetorizado (µs/linha)':>22} {'ganho':>8}")
+        for rows in args.linhas:
+            column = sample(rows)
+            legacy = best_of(lambda: legacy_func(column), args.repeticoes)
+            vectorized = best_of(lambda: vectorized_func(column), args.repeticoes)
+            print(f"{rows:>10} {legacy / rows * 1e6:>18.3f} {vectorized / rows * 1e6:>22.3f} {legacy / vectorized:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Uso de memória das apostas antes e depois de ``engine.schema.apply_schema``.
+
+    python -m benchmarks.bench_schema
+    python -m benchmarks.bench_schema --linhas 500000 --float32
+"""
+import argparse
+import random
+
+import pandas as pd
+
+from engine.schema import apply_schema, memory_report
+
+MARKETS = ['Under gols', 'Over gols', 'Under Cantos', 'AH+', 'AH-', 'Under HT']
+RESULTS = ['Ganha', 'Perdida', 'Ganha/devolvida', 'Perdida/devolvida', 'Devolvida', 'Aguardando']
+COUNTRIES = ['Brasil', 'Itália', 'Hungria', 'Inglaterra', 'Equador', 'Amistoso', 'Singapura']
+
+
+def sample_bets(rows, seed=0):
+    rnd = random.Random(seed)
+    dates = pd.to_datetime('2023-05-01') + pd.to_timedelta([rnd.randint(0, 900) for _ in range(rows)], unit='D')
+    profit = [rnd.uniform(-1, 1) for _ in range(rows)]
+    return pd.DataFrame({
+        'Nº': [str(i % 500 + 1) for i in range(rows)],
+        'Entrada': [f"Time {rnd.randint(1, 5000)} x Time {rnd.randint(1, 5000)}" for _ in range(rows)],
+        'País': [rnd.choice(COUNTRIES) for _ in range(rows)],
+        'Mercado': [rnd.choice(MARKETS) for _ in range(rows)],
+        'Stake': [rnd.choice([0.5, 1.0, 1.5]) for _ in range(rows)],
+        'Data': dates,
+        'Odd': [rnd.uniform(1.5, 2.5) for _ in range(rows)],
+        'Resultado': [rnd.choice(RESULTS) for _ in range(rows)],
+        'L/P': profit,
+        'Saldo': pd.Series(profit).cumsum(),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--float32', action='store_true', help="Converter Stake, L/P e Saldo para float32")
+    args = parser.parse_args(argv)
+
+    df = sample_bets(args.linhas)
+    compact = apply_schema(df, money_dtype='float32' if args.float32 else 'float64')
+    report = memory_report(df, compact)
+    print(report.to_string(formatters={
+        'antes': lambda v: '-' if pd.isna(v) else f"{v / 1e6:.2f} MB",
+        'depois': lambda v: f"{v / 1e6:.2f} MB",
+        'redução': lambda v: '-' if pd.isna(v) else f"{v:.0%}",
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Engine compartilhado pelos dashboards: configuração, carga dos dados e página Streamlit.
+
+Cada script ``dashboard_*.py`` apenas escolhe a sua configuração e chama
+``render_dashboard``; carga, cache e visualização ficam implementados aqui.
+
+A página e o refresher (que importam o Streamlit e o Plotly) só são importados
+quando pedidos, para que as ferramentas de linha de comando, como
+``python -m engine.cache``, não os carreguem.
+"""
+import importlib
+
+from engine.config import (BROKER, DASHBOARDS, ESCANTEIOS, GOLS, HANDICAPS, MONEYLINE, VIP,
+                           DashboardConfig)
+
+# Nome -> módulo, importado no primeiro acesso
+_LAZY = {
+    'render_dashboard': 'engine.dashboard',
+    'load_dashboard_data': 'engine.refresher',
+    'refresh_dashboard_data': 'engine.refresher',
+}
+
+__all__ = [
+    'BROKER', 'DASHBOARDS', 'ESCANTEIOS', 'GOLS', 'HANDICAPS', 'MONEYLINE', 'VIP',
+    'DashboardConfig', 'load_dashboard_data', 'refresh_dashboard_data', 'render_dashboard',
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
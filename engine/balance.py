@@ -0,0 +1,39 @@
+"""Saldo acumulado de uma seleção de meses, sem ordenar nem copiar as apostas.
+
+Cada snapshot guarda, linha a linha, a soma acumulada do L/P dentro do mês da
+aposta (a coluna ``MONTH_CUMSUM``). Como as apostas estão em ordem
+cronológica e o resumo mensal já tem o L/P total de cada mês, o saldo
+acumulado de qualquer seleção é, em cada mês, essa soma mais o total dos
+meses selecionados anteriores.
+"""
+import numpy as np
+
+from engine.config import PROFIT
+from engine.schema import MONTH_CUMSUM, MONTH_KEY
+
+
+def month_cumsum(df):
+    """Soma acumulada do L/P dentro de cada mês (None se não houver L/P).
+
+    ``df`` deve estar em ordem cronológica; linhas sem L/P ficam sem valor,
+    como em ``cumsum``.
+    """
+    if PROFIT not in df.columns:
+        return None
+    return df.groupby(MONTH_KEY, sort=False)[PROFIT].cumsum().to_numpy()
+
+
+def cumulative_balance(df, summary):
+    """Saldo acumulado do L/P nas apostas ``df`` de uma seleção de meses de um snapshot.
+
+    ``df`` vem de ``snapshot.index.select`` (em ordem cronológica, com a coluna
+    ``MONTH_CUMSUM``) e ``summary`` é o resumo mensal do snapshot.
+    """
+    months = df[MONTH_KEY].to_numpy()
+    if len(months) == 0:
+        return np.empty(0)
+    # Cada mês ocupa um intervalo contíguo: somar a cada um o total dos meses anteriores
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(months)) + 1))
+    totals = summary['lucro'].reindex(months[starts]).to_numpy()
+    offsets = np.concatenate(([0.0], np.cumsum(totals)[:-1]))
+    return df[MONTH_CUMSUM].to_numpy() + np.repeat(offsets, np.diff(np.append(starts, len(months))))
@@ -0,0 +1,162 @@
+"""Cache em disco das abas mensais das planilhas.
+
+Cada aba já processada é salva em Parquet em ``.cache/abas/<id da planilha>/``.
+Abas de meses encerrados (passado o período de carência) são tratadas como
+imutáveis e lidas direto do disco, desde que a cópia tenha sido gravada depois
+do encerramento; uma cópia anterior (o app parado desde o meio do mês) é
+baixada de novo uma vez. O mês atual continua sendo baixado a cada carga. Se
+o download falhar, a última cópia salva é usada como reserva.
+
+Para invalidar o cache manualmente:
+
+    python -m engine.cache limpar                       # todas as planilhas
+    python -m engine.cache limpar --planilha <id>       # uma planilha
+    python -m engine.cache limpar --planilha <id> --aba "Maio/23"
+    python -m engine.cache listar
+
+Limpar o cache também descarta o histórico consolidado de ``engine.store`` e
+os snapshots publicados por ``engine.shared``, montados a partir das abas.
+Servidores em execução mantêm os dados em memória: reinicie-os depois.
+"""
+import argparse
+import calendar
+import logging
+import shutil
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from engine.files import replace_file
+from engine.months import month_map
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'abas'
+
+# Dias após o fim do mês durante os quais a aba ainda é considerada mutável
+# (lançamentos atrasados, correções de resultados)
+GRACE_DAYS = 7
+
+
+def sheet_id_from_url(sheet_url):
+    return sheet_url.split("/d/")[1].split("/")[0]
+
+
+def cache_path(sheet_id, sheet_name):
+    # "/" não pode fazer parte do nome do arquivo ("Maio/23" -> "Maio-23")
+    return CACHE_DIR / sheet_id / f"{sheet_name.replace('/', '-')}.parquet"
+
+
+def closed_since(sheet_name, grace_days=GRACE_DAYS):
+    """Dia a partir do qual a aba ("Maio/23") é considerada encerrada, ou None se o nome for inválido."""
+    try:
+        month_name, year = sheet_name.split('/')
+        month = month_map[month_name]
+        year = int(year) + 2000
+    except (ValueError, KeyError):
+        return None
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    return last_day + timedelta(days=grace_days + 1)
+
+
+def is_closed(sheet_name, today=None, grace_days=GRACE_DAYS):
+    """Indica se a aba ("Maio/23") é de um mês encerrado há mais de ``grace_days`` dias."""
+    closed = closed_since(sheet_name, grace_days)
+    return closed is not None and (today or date.today()) >= closed
+
+
+def read(sheet_id, sheet_name):
+    path = cache_path(sheet_id, sheet_name)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        # Arquivo corrompido ou de versão incompatível: descartar e baixar de novo
+        path.unlink(missing_ok=True)
+        return None
+
+
+def read_closed(sheet_id, sheet_name):
+    """Cópia da aba encerrada, se gravada depois do encerramento; None caso contrário."""
+    closed = closed_since(sheet_name)
+    try:
+        written = cache_path(sheet_id, sheet_name).stat().st_mtime
+    except OSError:
+        return None
+    if closed is None or written < datetime.combine(closed, time()).timestamp():
+        return None
+    return read(sheet_id, sheet_name)
+
+
+def write(sheet_id, sheet_name, df):
+    """Grava a aba no cache. Falhas só são registradas, o cache é apenas uma otimização."""
+    try:
+        replace_file(cache_path(sheet_id, sheet_name), lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    except Exception:
+        logger.warning("Falha ao gravar a aba %s no cache", sheet_name, exc_info=True)
+
+
+def invalidate(sheet_id=None, sheet_name=None):
+    """Remove entradas do cache e retorna quantas abas foram apagadas.
+
+    O histórico consolidado e os snapshots publicados, montados a partir das
+    abas, são sempre apagados: senão voltariam a servir os dados antigos.
+    """
+    removed = remove_tabs(sheet_id, sheet_name)
+    # Importados aqui: ambos dependem deste módulo
+    from engine import shared, store
+    store.invalidate()
+    shared.invalidate()
+    return removed
+
+
+def remove_tabs(sheet_id=None, sheet_name=None):
+    if sheet_id is None:
+        removed = len(list(CACHE_DIR.glob('*/*.parquet')))
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        return removed
+    if sheet_name is not None:
+        path = cache_path(sheet_id, sheet_name)
+        if path.exists():
+            path.unlink()
+            return 1
+        return 0
+    removed = len(list((CACHE_DIR / sheet_id).glob('*.parquet')))
+    shutil.rmtree(CACHE_DIR / sheet_id, ignore_errors=True)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerencia o cache em disco das abas das planilhas.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    limpar_help = ("Remove abas do cache, o histórico e os snapshots publicados "
+                   "(reinicie os servidores em execução depois)")
+    limpar = subparsers.add_parser('limpar', help=limpar_help, description=limpar_help)
+    limpar.add_argument('--planilha', help="ID ou URL da planilha (padrão: todas)")
+    limpar.add_argument('--aba', help='Nome da aba, ex: "Maio/23" (requer --planilha)')
+
+    subparsers.add_parser('listar', help="Lista as abas em cache")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'listar':
+        for path in sorted(CACHE_DIR.glob('*/*.parquet')):
+            state = "fechada" if is_closed(path.stem.replace('-', '/')) else "aberta"
+            print(f"{path.parent.name}  {path.stem.replace('-', '/')}  ({state})")
+        return
+
+    if args.aba and not args.planilha:
+        parser.error("--aba requer --planilha")
+    sheet_id = args.planilha
+    if sheet_id and "/d/" in sheet_id:
+        sheet_id = sheet_id_from_url(sheet_id)
+    removed = invalidate(sheet_id, args.aba)
+    print(f"{removed} aba(s) removida(s) do cache, com o histórico e os snapshots publicados.")
+    print("Reinicie os servidores em execução: eles mantêm os dados anteriores em memória.")
+
+
+if __name__ == '__main__':
+    main()
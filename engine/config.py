@@ -0,0 +1,132 @@
+"""Configuração de cada dashboard: planilha, mês inicial, colunas e regras de mercado.
+
+As colunas de cada planilha são renomeadas para nomes canônicos ao carregar
+(``Stake`` para a unidade apostada e ``L/P`` para o lucro/prejuízo), para que
+filtros, métricas e gráficos sejam escritos uma única vez. Na tabela de
+detalhamento os nomes originais da planilha voltam a ser exibidos.
+"""
+from dataclasses import dataclass, field
+
+# Nomes canônicos usados internamente pelo engine
+STAKE = 'Stake'
+PROFIT = 'L/P'
+NUMERIC_COLUMNS = [PROFIT, 'Odd', STAKE, 'Saldo', 'EV']
+
+
+@dataclass(frozen=True)
+class DashboardConfig:
+    key: str
+    title: str
+    sheet_url: str
+    start_month: int
+    start_year: int
+    # Colunas lidas da planilha, na ordem em que aparecem na tabela
+    columns: tuple
+    # Nome na planilha -> nome canônico, para as colunas que diferem
+    column_names: dict = field(default_factory=dict)
+    # Formato da coluna Data na planilha; o ano sempre vem do nome da aba
+    date_format: str = '%d/%m/%y'
+    # Substituições aplicadas à coluna Mercado, em ordem: (texto, novo texto)
+    market_renames: tuple = ()
+    page_title: str = None
+    win_rate_label: str = "📈 Taxa de Acerto"
+    multi_month_title: str = "Múltiplos Meses/Anos"
+    # Ano da opção "Acumulado <ano>" no filtro de período (None para não oferecer)
+    accumulated_year: int = 2025
+    stake_decimals: int = 3
+    # Páginas da tabela com mais apostas que isto são exibidas sem cores (sem o Styler
+    # do pandas); deve ficar abaixo do maior tamanho de página (table.PAGE_SIZES)
+    table_style_max_rows: int = 100
+    # Máximo de pontos da linha do saldo em períodos longos (None para não reduzir)
+    chart_max_points: int = 300
+
+    @property
+    def display_names(self):
+        """Nome canônico -> nome exibido (o da planilha)."""
+        return {canonical: original for original, canonical in self.column_names.items()}
+
+
+_GOLS_RENAMES = (('Under', 'Under gols'), ('Over', 'Over gols'))
+
+_BETPRO_COLUMNS = ('Nº', 'Data', 'Entrada', 'Liga', 'Mercado', 'Unidade', 'EV', 'Odd', 'Resultado',
+                   'Lucro/prejuízo', 'Saldo')
+_BETPRO_NAMES = {'Unidade': STAKE, 'Lucro/prejuízo': PROFIT}
+
+BROKER = DashboardConfig(
+    key='broker',
+    title='Dashboard - Grag Apostador (Broker)',
+    page_title='Dashboard - Grag Apostador (broker)',
+    sheet_url="https://docs.google.com/spreadsheets/d/1HhrDjcCB6nIfnbJxh7vRCOkfZ372Ln3heHIA1p6w6aI/edit?usp=sharing",
+    start_month=5,
+    start_year=2023,
+    columns=('Nº', 'Entrada', 'País', 'Mercado', 'Stake', 'Data', 'Odd', 'Resultado', 'L/P', 'Saldo'),
+    date_format='%d/%m',
+    market_renames=(('Under', 'Under gols'), ('Cantos-', 'Under Cantos'), ('Over', 'Over gols')),
+)
+
+MONEYLINE = DashboardConfig(
+    key='moneyline',
+    title='Dashboard - Grag Apostador BetPro IA - MoneyLine',
+    sheet_url="https://docs.google.com/spreadsheets/d/1ISshXJJg1XYDxYARcfrpRNFtQ2jfaCypB6Lp-SoG1ls/edit?usp=sharing",
+    start_month=12,
+    start_year=2024,
+    columns=_BETPRO_COLUMNS,
+    column_names=_BETPRO_NAMES,
+    market_renames=_GOLS_RENAMES,
+    win_rate_label="📈 Win-rate",
+    multi_month_title="Saldo Acumulado",
+)
+
+GOLS = DashboardConfig(
+    key='gols',
+    title='Dashboard - Grag Apostador BetPro IA - Gols Asiáticos',
+    sheet_url="https://docs.google.com/spreadsheets/d/1eBsyCzVzA1lO44cJLQis7Wf5-H1kW4b7UTeax-oYO3s/edit?usp=sharing",
+    start_month=12,
+    start_year=2024,
+    columns=_BETPRO_COLUMNS,
+    column_names=_BETPRO_NAMES,
+    market_renames=_GOLS_RENAMES,
+    win_rate_label="📈 Win-rate",
+    multi_month_title="Saldo Acumulado",
+)
+
+HANDICAPS = DashboardConfig(
+    key='handicaps',
+    title='Dashboard - Grag Apostador BetPro IA - Handicaps Asiáticos',
+    sheet_url="https://docs.google.com/spreadsheets/d/1ibplcyTc21JhWgeDgkFqfXSxd3xdcOus14uTHBJgzGc/edit?usp=sharing",
+    start_month=12,
+    start_year=2024,
+    columns=_BETPRO_COLUMNS,
+    column_names=_BETPRO_NAMES,
+    market_renames=_GOLS_RENAMES,
+    win_rate_label="📈 Win-rate",
+    multi_month_title="Saldo Acumulado",
+)
+
+ESCANTEIOS = DashboardConfig(
+    key='escanteios',
+    title='Dashboard - Grag Apostador BetPro IA - Escanteios',
+    sheet_url="https://docs.google.com/spreadsheets/d/1Cfi_rEPEO92H3OTfE9753eTFtDYnGFcJ2Oew2hqeYSQ/edit?usp=sharing",
+    start_month=11,
+    start_year=2024,
+    columns=_BETPRO_COLUMNS,
+    column_names=_BETPRO_NAMES,
+    win_rate_label="📈 Win-rate",
+    multi_month_title="Saldo Acumulado",
+)
+
+VIP = DashboardConfig(
+    key='vip',
+    title='Dashboard - Grag Apostador (VIP)',
+    sheet_url="https://docs.google.com/spreadsheets/d/1Cbfoy6hPOqXEsTyqnlhqnTc7g7u1IXmtRcPHLdy55zA/edit?usp=sharing",
+    start_month=2,
+    start_year=2025,
+    columns=('Nº', 'Entrada', 'Un', 'Mercado', 'Data', 'Odd', 'Resultado', 'L/P', 'Saldo'),
+    column_names={'Un': STAKE},
+    date_format='%d/%m',
+    market_renames=(('Under', 'Under gols'), ('Cantos-', 'Under cantos'), ('Over', 'Over gols')),
+    accumulated_year=None,
+    stake_decimals=2,
+)
+
+DASHBOARDS = {config.key: config for config in (BROKER, MONEYLINE, GOLS, HANDICAPS, ESCANTEIOS, VIP)}
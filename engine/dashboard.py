@@ -0,0 +1,501 @@
+"""Página Streamlit comum a todos os dashboards: filtros, métricas, gráficos e tabela."""
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+import streamlit.components.v1 as components
+
+from engine.balance import cumulative_balance
+from engine.config import PROFIT, STAKE
+from engine.downsample import PERIODS, lttb, period_profit
+from engine.export import FORMATS, export, export_key
+from engine.refresher import is_refreshing, load_dashboard_data, refresh_dashboard_data
+from engine.months import month_key_label
+from engine.schema import BALANCE_COLOR, INTERNAL_COLUMNS, MONTH_CUMSUM, MONTH_KEY, RESULT_COLOR
+from engine.styles import css, sign_colors, style_map
+from engine.table import DEFAULT_PAGE_SIZE, PAGE_SIZES, page, page_count, search, sort
+from engine.summary import period_metrics
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+# Períodos com mais dias que isto usam o eixo de datas, com o saldo reduzido e
+# o lucro somado por semana (ou por mês, acima de MONTHLY_BARS_DAYS)
+LONG_RANGE_DAYS = 180
+MONTHLY_BARS_DAYS = 730
+
+
+# Função para escolher a logo com base no tema
+def setup_theme_logo():
+    # Componente Javascript para detectar o tema
+    components.html(
+        """
+        <script>
+            // Detectar se o tema é escuro
+            const isDark = window.matchMedia && window.matchMedia('(prefers-color-scheme: dark)').matches;
+
+            // Enviar o tema para o Python
+            window.parent.postMessage({
+                type: 'theme',
+                isDark: document.body.classList.contains('dark')
+            }, '*');
+        </script>
+        """,
+        height=0,
+    )
+
+    # Se não houver tema definido na sessão, assumir dark como padrão
+    if 'theme' not in st.session_state:
+        st.session_state.theme = 'dark'
+
+    # Definir os caminhos das imagens
+    logo_dark = ASSETS_DIR / "logo_vetor.png"
+    logo_light = ASSETS_DIR / "logo_vetor.png"
+
+    # Usar o tema da sessão para selecionar a logo
+    logo_path = logo_dark if st.session_state.theme == 'dark' else logo_light
+
+    # Mostrar a imagem
+    st.sidebar.image(str(logo_path), width=200)
+
+
+# Buscar as abas em aberto novamente na planilha, sem esperar a atualização periódica
+def render_refresh_button(config):
+    st.sidebar.button("🔄 Atualizar dados", on_click=refresh_dashboard_data, args=(config,))
+
+
+def select_period(snapshot, config):
+    """Mostra o filtro de período na barra lateral.
+
+    Retorna as apostas selecionadas, as chaves dos meses e se o saldo foi
+    recalculado como acumulado da seleção.
+    """
+    # Meses disponíveis, do mais recente ao mais antigo, com o rótulo "Mês/Ano" de cada chave
+    available_keys = snapshot.index.keys[::-1]
+    keys_by_label = {month_key_label(key): key for key in available_keys}
+    sorted_months_years = list(keys_by_label)
+
+    # Criar opção "Acumulado <ano>"
+    accumulated_label = None
+    accumulated_months = []
+    if config.accumulated_year is not None:
+        accumulated_label = f"Acumulado {config.accumulated_year}"
+        accumulated_months = [key for key in available_keys if key // 12 == config.accumulated_year]
+
+    # Adicionar a opção "Acumulado <ano>" apenas se houver dados do ano
+    selection_options = sorted_months_years.copy()
+    if accumulated_months:
+        selection_options.insert(0, accumulated_label)
+
+    # Filtro de mês/ano
+    selected_months_years = st.sidebar.multiselect(
+        "Selecione o período:",
+        selection_options,
+        default=[selection_options[0]]  # Selecionar o primeiro da lista (mais recente ou acumulado)
+    )
+
+    render_refresh_button(config)
+
+    # Lógica de filtragem com tratamento especial para "Acumulado <ano>"
+    selected = [keys_by_label[m] for m in selected_months_years if m != accumulated_label]
+    is_accumulated = accumulated_label in selected_months_years
+    if is_accumulated:
+        selected += accumulated_months
+
+    # As apostas do índice já estão em ordem cronológica: cada mês é uma fatia contígua
+    df_filtered = snapshot.index.select(selected)
+    cumulative = is_accumulated or len(selected_months_years) > 1
+    if cumulative and MONTH_CUMSUM in df_filtered.columns:
+        # Mais de um mês: Saldo como valor acumulado da coluna 'L/P', montado a partir
+        # do acumulado de cada mês (assign não copia as demais colunas)
+        df_filtered = df_filtered.assign(Saldo=cumulative_balance(df_filtered, snapshot.summary))
+
+    return df_filtered, selected, cumulative
+
+
+def render_metrics(summary, selected, cumulative, config):
+    # Métricas calculadas a partir do resumo mensal, somando só as linhas dos meses selecionados
+    metrics = period_metrics(summary, selected, cumulative)
+
+    # Layout principal com quatro colunas
+    col1, col2, col3, col4 = st.columns(4)
+
+    # 💰 Saldo Total
+    with col1:
+        if metrics['saldo'] is not None:
+            st.metric(label="💰 Saldo Total", value=f"{metrics['saldo']:.2f} unidades")
+        else:
+            st.metric(label="💰 Saldo Total", value="N/A")
+
+    # 📊 ROI
+    with col2:
+        if metrics['roi'] is not None:
+            st.metric(label="📊 ROI", value=f"{metrics['roi']:.1f}%")
+        else:
+            st.metric(label="📊 ROI", value="N/A")
+
+    # 📈 Taxa de Acerto
+    with col3:
+        if metrics['taxa_acerto'] is not None:
+            st.metric(label=config.win_rate_label, value=f"{metrics['taxa_acerto']:.1f}%")
+        else:
+            st.metric(label=config.win_rate_label, value="N/A")
+
+    # 🎯 Odds Média
+    with col4:
+        if metrics['odd_media'] is not None:
+            st.metric(label="🎯 Odd Média", value=f"{metrics['odd_media']:.2f}")
+        else:
+            st.metric(label="🎯 Odd Média", value="N/A")
+
+
+def daily_balance_figure(df_daily_balance, month_title):
+    """Um ponto e uma barra por dia, com o eixo X em categorias "dia" ou "dia/mês"."""
+    # Determinar se estamos trabalhando com múltiplos meses
+    is_multi_month = len(df_daily_balance) > 31
+
+    # Criar a coluna formatada de data para rótulos do eixo X
+    if is_multi_month:
+        df_daily_balance['Data_Formatada'] = df_daily_balance['Data'].dt.strftime('%d/%m')
+    else:
+        df_daily_balance['Data_Formatada'] = df_daily_balance['Data'].dt.strftime('%d')
+
+    # Criar gráfico de linha para saldo
+    fig_balance = px.line(
+        df_daily_balance,
+        x='Data_Formatada',
+        y='Saldo',
+        title=f'Evolução do Saldo - {month_title}',
+        markers=False,
+        line_shape="spline"  # Transforma a linha em curva suave
+    )
+
+    # Definir cores de candles para lucro diário (verde para positivo, vermelho para negativo)
+    bar_colors = np.where(df_daily_balance['Lucro'] > 0, '#2ECC71', '#EF5350')
+
+    # Adicionar barras do lucro diário com as cores de candles
+    fig_balance.add_trace(go.Bar(
+        x=df_daily_balance['Data_Formatada'],
+        y=df_daily_balance['Lucro'],
+        name='Lucro Diário',
+        marker=dict(color=bar_colors),
+        opacity=0.80,  # Deixa as barras levemente transparentes para melhor visualização
+        showlegend=False  # Hides 'Lucro Diário' from the legend
+    ))
+
+    # Configurar eixo X de acordo com a quantidade de dados
+    if is_multi_month:
+        # Calcular o passo ideal para mostrar aproximadamente 20 pontos no eixo
+        step = max(1, len(df_daily_balance) // 20)
+
+        fig_balance.update_xaxes(
+            title="Dia/Mês",
+            tickangle=45,  # Rotacionar os rótulos para melhor leitura
+            tickmode="array",
+            tickvals=df_daily_balance['Data_Formatada'][::step],
+            ticktext=df_daily_balance['Data_Formatada'][::step],
+            gridcolor='rgba(128, 128, 128, 0.15)',
+            gridwidth=1,
+            showgrid=True
+        )
+    else:
+        # Configuração normal para um único mês
+        fig_balance.update_xaxes(
+            title="Dia",
+            tickmode="linear",
+            gridcolor='rgba(128, 128, 128, 0.15)',
+            gridwidth=1,
+            showgrid=True,
+            dtick=1
+        )
+
+    return fig_balance
+
+
+def long_range_balance_figure(df_daily_balance, span_days, month_title, config):
+    """Saldo reduzido por LTTB e lucro somado por semana ou mês, com o eixo X em datas."""
+    line = df_daily_balance
+    if config.chart_max_points is not None:
+        dates = df_daily_balance['Data'].to_numpy().view('int64')
+        line = df_daily_balance.iloc[lttb(dates, df_daily_balance['Saldo'].to_numpy(), config.chart_max_points)]
+
+    fig_balance = px.line(
+        line,
+        x='Data',
+        y='Saldo',
+        title=f'Evolução do Saldo - {month_title}',
+        markers=False,
+        line_shape="spline"  # Transforma a linha em curva suave
+    )
+
+    period = 'mês' if span_days > MONTHLY_BARS_DAYS else 'semana'
+    starts, profit = period_profit(df_daily_balance, period)
+    fig_balance.add_trace(go.Bar(
+        x=starts,
+        y=profit,
+        name=f'Lucro por {period}',
+        marker=dict(color=np.where(profit > 0, '#2ECC71', '#EF5350')),
+        opacity=0.80,
+        xperiod=PERIODS[period][1],
+        xperiodalignment="middle",
+        showlegend=False
+    ))
+
+    fig_balance.update_xaxes(
+        title="Data",
+        tickformat="%d/%m/%y",
+        tickangle=45,
+        gridcolor='rgba(128, 128, 128, 0.15)',
+        gridwidth=1,
+        showgrid=True
+    )
+    return fig_balance
+
+
+def render_balance_chart(df_filtered, config):
+    # 📈 Evolução do Saldo
+    if 'Saldo' not in df_filtered.columns or df_filtered['Saldo'].isna().all():
+        return
+
+    st.subheader("📈 Evolução do Saldo Diário")
+
+    # Apostas com data e saldo (já em ordem cronológica)
+    df_graph = df_filtered.dropna(subset=['Data', 'Saldo'])
+
+    # Obter o nome do mês/ano único para o título
+    unique_months = df_graph[MONTH_KEY].unique()
+    if len(unique_months) == 1:
+        month_title = month_key_label(unique_months[0])  # Usa o formato "Mês/Ano"
+    else:
+        month_title = config.multi_month_title
+
+    # Agrupar por Data e pegar o saldo final do dia
+    df_daily_balance = df_graph.groupby('Data', as_index=False)['Saldo'].last()
+
+    # Calcular o lucro diário (diferença do saldo em relação ao dia anterior)
+    df_daily_balance['Lucro'] = df_daily_balance['Saldo'].diff().fillna(0)
+
+    span_days = (df_daily_balance['Data'].iloc[-1] - df_daily_balance['Data'].iloc[0]).days
+    if span_days > LONG_RANGE_DAYS:
+        fig_balance = long_range_balance_figure(df_daily_balance, span_days, month_title, config)
+    else:
+        fig_balance = daily_balance_figure(df_daily_balance, month_title)
+
+    # Ajustar eixo Y com o novo título
+    fig_balance.update_yaxes(
+        title="Saldo total (unidades)"
+    )
+
+    # Ajustar layout para evitar sobreposição
+    fig_balance.update_layout(barmode='overlay')
+
+    # Mostrar o gráfico no Streamlit
+    st.plotly_chart(fig_balance, use_container_width=True)
+
+
+def render_market_charts(df_filtered):
+    # 📊 Gráficos de Resultados e Categorias
+    col_left, col_right = st.columns(2)
+
+    with col_left:
+        if 'Mercado' in df_filtered.columns and PROFIT in df_filtered.columns:
+            mercado_pl = df_filtered.groupby('Mercado')[PROFIT].sum().reset_index()
+            mercado_pl = mercado_pl.sort_values(PROFIT, ascending=True)
+            fig_mercado = px.bar(
+                mercado_pl,
+                x=PROFIT,
+                y='Mercado',
+                title='Lucro por Mercado',
+                color=PROFIT,
+                color_continuous_scale='RdYlGn',
+                color_continuous_midpoint=0,  # Define o zero como ponto neutro
+                orientation='h',  # Define a orientação horizontal
+                labels={PROFIT: 'Lucro em unidades'}  # Adiciona esta linha para mudar o título do eixo
+            )
+
+            st.plotly_chart(fig_mercado)
+
+    with col_right:
+        if 'Mercado' in df_filtered.columns and PROFIT in df_filtered.columns and STAKE in df_filtered.columns:
+            # Calcular lucro total e investimento total por mercado
+            roi_df = df_filtered.groupby('Mercado').agg({PROFIT: 'sum', STAKE: 'sum'}).reset_index()
+
+            # Calcular ROI
+            roi_df['ROI'] = roi_df[PROFIT] / roi_df[STAKE] * 100
+            roi_df = roi_df.sort_values('ROI', ascending=True)
+
+            # Criar gráfico de barras horizontais para ROI
+            fig_roi = px.bar(
+                roi_df,
+                x='ROI',  # ROI no eixo X
+                y='Mercado',  # Mercado no eixo Y
+                title='ROI por Mercado',
+                color='ROI',
+                color_continuous_scale='RdYlGn',
+                color_continuous_midpoint=0,  # Define o zero como ponto neutro
+                orientation='h'  # Barras na horizontal
+            )
+            # Atualizar o formato dos rótulos do eixo X para exibir como porcentagem
+            fig_roi.update_layout(
+                xaxis_tickformat=".1f",  # Mantém uma casa decimal
+                xaxis_ticksuffix="%"  # Adiciona o símbolo de porcentagem
+            )
+
+            st.plotly_chart(fig_roi)
+
+
+def table_column_config(df_table, config):
+    """Formato de exibição das colunas da tabela; os valores continuam numéricos."""
+    decimals = f"%.{config.stake_decimals}f"
+    formats = {STAKE: decimals, "Odd": "%.3f", PROFIT: "%.3f", "EV": "%.3f", "Saldo": "%.3f u"}
+    column_config = {}
+    for column in df_table.columns:
+        label = config.display_names.get(column, column)
+        if column in formats:
+            column_config[label] = st.column_config.NumberColumn(label, format=formats[column], width="auto")
+        elif column == "Data":
+            column_config[label] = st.column_config.DateColumn(label, format="DD/MM/YY", width="auto")
+        else:
+            column_config[label] = st.column_config.Column(label, width="auto")
+    return column_config
+
+
+def render_bets_table(df_filtered, entry, cumulative, config):
+    # 📋 Tabela de Detalhamento de Apostas
+    st.subheader("📋 Detalhamento das Apostas")
+
+    df_bets = df_filtered.dropna(subset=["Entrada"])  # Remove rows without 'Entrada'
+    profit_label = config.display_names.get(PROFIT, PROFIT)
+
+    # Busca, ordenação e paginação feitas aqui: só a página escolhida vai para o navegador
+    search_col, sort_col, order_col, size_col = st.columns([3, 2, 2, 1])
+    text = search_col.text_input("🔎 Buscar por entrada ou mercado")
+    # Um único mês: ordenar pelo Nº da aposta. Vários meses: o Nº recomeça a
+    # cada aba, então ordenar pela data
+    sort_columns = {"Data": "Data", "Nº": "Nº", profit_label: PROFIT}
+    sort_label = sort_col.selectbox("Ordenar por", list(sort_columns),
+                                    index=0 if df_bets[MONTH_KEY].nunique() > 1 else 1)
+    descending = order_col.selectbox("Ordem", ["Decrescente", "Crescente"]) == "Decrescente"
+    page_size = size_col.selectbox("Por página", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+
+    positions = sort(df_bets, search(df_bets, text), sort_columns[sort_label], descending)
+    if len(positions) == 0:
+        st.info("Nenhuma aposta encontrada.")
+        return
+    pages = page_count(len(positions), page_size)
+    number = 1
+    if pages > 1:
+        number = st.number_input(f"Página (de {pages})", min_value=1, max_value=pages, value=1, step=1)
+    df_table = page(df_bets, positions, number, page_size)
+    first = (number - 1) * page_size + 1
+    st.caption(f"Apostas {first}–{first + len(df_table) - 1} de {len(positions)}")
+
+    # Cores das apostas da página, calculadas com o snapshot
+    if RESULT_COLOR in df_table.columns:
+        colors = pd.DataFrame({"Resultado": df_table[RESULT_COLOR], "Saldo": df_table[BALANCE_COLOR]})
+    else:
+        colors = style_map(df_table)
+    if cumulative:
+        # Saldo recalculado como acumulado da seleção: cores pelo novo sinal
+        colors = colors.assign(Saldo=sign_colors(df_table["Saldo"]))
+    colors = colors.reset_index(drop=True)
+    df_table = df_table.drop(['Nº', *INTERNAL_COLUMNS], axis=1, errors='ignore').reset_index(drop=True)
+
+    # Formatos de exibição definidos antes de renomear as colunas
+    column_config = table_column_config(df_table, config)
+
+    # Exibir as colunas com os nomes usados na planilha
+    df_table = df_table.rename(columns=config.display_names)
+
+    if len(df_table) > config.table_style_max_rows:
+        # O Styler serializa o estilo de cada célula: em páginas grandes, exibir sem cores
+        st.caption(f"Cores desativadas em páginas com mais de {config.table_style_max_rows} apostas.")
+        table = df_table
+    else:
+        # As cores de "Resultado" se repetem em "L/P"
+        styles = pd.DataFrame({
+            "Resultado": css(colors["Resultado"]),
+            profit_label: css(colors["Resultado"]),
+            "Saldo": css(colors["Saldo"]),
+        })
+        table = df_table.style.apply(lambda df: styles[df.columns], axis=None, subset=list(styles.columns))
+
+    # Display in Streamlit
+    st.dataframe(table, use_container_width=True, column_config=column_config)
+
+    render_downloads(df_filtered, df_bets, positions, entry, cumulative, config)
+
+
+# 📥 Download das apostas encontradas, na ordem escolhida e sem formatação
+def render_downloads(df_filtered, df_bets, positions, entry, cumulative, config):
+    def make_frame():
+        df_export = df_bets.take(positions).drop(['Nº', *INTERNAL_COLUMNS], axis=1, errors='ignore')
+        return df_export.rename(columns=config.display_names)
+
+    # Mesmo snapshot, meses, busca e ordem: mesmo arquivo
+    key = export_key(config.key, entry.updated_at, cumulative, df_filtered.index.to_numpy(), positions)
+    for column, (fmt, (extension, mime, _)) in zip(st.columns(len(FORMATS)), FORMATS.items()):
+        # Gerado só no clique, em outra thread, sem refazer o arquivo a cada rerun
+        column.download_button(
+            label=f"📥 Download dos dados ({fmt})",
+            data=partial(export, key, fmt, make_frame),
+            file_name=f"betting_data.{extension}",
+            mime=mime,
+        )
+
+
+def format_age(seconds):
+    if seconds < 60:
+        return "menos de 1 min"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    return f"{int(seconds // 3600)} h {int(seconds % 3600 // 60)} min"
+
+
+# Idade dos dados exibidos e situação da atualização em segundo plano
+def render_data_status(entry, config):
+    status = f"🕒 Dados atualizados há {format_age(entry.age)}"
+    if is_refreshing(config):
+        status += " · atualizando..."
+    st.sidebar.caption(status)
+    if entry.failed:
+        st.sidebar.warning("A última atualização falhou; exibindo os dados anteriores.")
+
+
+def render_dashboard(config):
+    """Monta a página completa do dashboard descrito por ``config``."""
+    # Configuração do Streamlit
+    st.set_page_config(page_title=config.page_title or config.title, layout='wide')
+    st.title(config.title)
+
+    with st.spinner("Carregando dados..."):
+        entry = load_dashboard_data(config)
+    snapshot = entry.snapshot
+    for nivel, texto in entry.mensagens:
+        if nivel == 'error':
+            st.error(texto)
+        else:
+            st.warning(texto)
+
+    if snapshot is not None:
+        # Adicionar o logo da empresa
+        setup_theme_logo()
+
+        st.sidebar.header("📊 Filtros")
+
+        df_filtered, selected, cumulative = select_period(snapshot, config)
+        render_data_status(entry, config)
+
+        render_metrics(snapshot.summary, selected, cumulative, config)
+        render_balance_chart(df_filtered, config)
+        render_market_charts(df_filtered)
+        render_bets_table(df_filtered, entry, cumulative, config)
+    else:
+        st.error("⚠️ Não foi possível carregar os dados.")
+        # Tentar de novo sem esperar a próxima atualização
+        render_refresh_button(config)
+
+    st.write("Desenvolvido por Grag Apostador ⚽")
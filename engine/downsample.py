@@ -0,0 +1,55 @@
+"""Redução dos pontos do gráfico de saldo em períodos longos.
+
+Com anos de histórico, um ponto e uma barra por dia deixam o JSON da figura
+do Plotly proporcional ao histórico. A linha do saldo passa pelo
+Largest-Triangle-Three-Buckets (LTTB): os dias são divididos em faixas e, de
+cada faixa, fica o ponto que forma o maior triângulo com o ponto escolhido
+na faixa anterior e a média da seguinte, o que preserva picos e quedas. As
+barras de lucro diário são somadas por semana ou por mês.
+"""
+import numpy as np
+
+# Período das barras -> (frequência do pandas, largura da barra no Plotly)
+PERIODS = {
+    'semana': ('W', 7 * 24 * 3600 * 1000),
+    'mês': ('M', 'M1'),
+}
+
+
+def lttb(x, y, threshold):
+    """Posições dos ``threshold`` pontos escolhidos de ``(x, y)``, em ordem.
+
+    O primeiro e o último ponto sempre ficam. Com ``threshold`` maior ou igual
+    à quantidade de pontos (ou menor que 3), todos são mantidos.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # threshold - 2 faixas com os pontos internos; nenhuma fica vazia, pois threshold < n
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x = x[end:edges[bucket + 2]].mean()
+            next_y = y[end:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Dobro da área do triângulo (ponto anterior, candidato, média da faixa seguinte)
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def period_profit(daily, period):
+    """Lucro somado por ``period`` (uma chave de ``PERIODS``), com a data de início de cada um."""
+    freq = PERIODS[period][0]
+    grouped = daily.groupby(daily['Data'].dt.to_period(freq))['Lucro'].sum()
+    return grouped.index.start_time, grouped.to_numpy()
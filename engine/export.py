@@ -0,0 +1,114 @@
+"""Arquivos de download das apostas filtradas (CSV, Parquet e Excel).
+
+Os arquivos só são gerados quando alguém clica no botão de download, e são
+gravados em disco aos pedaços de ``CHUNK_ROWS`` linhas, sem montar o arquivo
+inteiro em memória. Cada arquivo fica em ``.cache/exportacoes/`` com uma
+chave derivada do snapshot e do filtro: outro clique com o mesmo filtro (de
+qualquer sessão) reaproveita o arquivo. Só os ``MAX_FILES`` usados mais
+recentemente são mantidos; os usados há menos de ``MIN_AGE`` segundos nunca
+são apagados, pois outra sessão pode estar lendo-os.
+
+As colunas numéricas e de datas são exportadas com os valores originais, sem
+a formatação usada na tabela.
+"""
+import hashlib
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from engine.cache import CACHE_DIR
+from engine.files import replace_file
+
+EXPORT_DIR = CACHE_DIR.parent / 'exportacoes'
+CHUNK_ROWS = 5000
+MAX_FILES = 50
+MIN_AGE = 60
+
+
+def write_csv(df, path):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        df.to_csv(f, index=False, date_format='%d/%m/%Y', chunksize=CHUNK_ROWS)
+
+
+def write_parquet(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=CHUNK_ROWS):
+            writer.write_batch(batch)
+
+
+def write_xlsx(df, path):
+    # Modo write_only: as linhas vão direto para o arquivo, sem manter a planilha em memória
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Apostas')
+    sheet.append(list(df.columns))
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS]
+        if 'Data' in chunk.columns:
+            chunk = chunk.assign(Data=chunk['Data'].dt.date)
+        # Valores vazios (NaN, NaT, NA) viram células vazias
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+# Formato -> (extensão, tipo MIME, função de gravação)
+FORMATS = {
+    'CSV': ('csv', 'text/csv', write_csv),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', write_parquet),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', write_xlsx),
+}
+
+
+def export_key(*parts):
+    """Chave do arquivo a partir das partes do filtro (textos, números ou arrays)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.tobytes() if hasattr(part, 'tobytes') else repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def export_path(key, fmt):
+    return EXPORT_DIR / f'{key}.{FORMATS[fmt][0]}'
+
+
+def prune(max_files=MAX_FILES, min_age=MIN_AGE):
+    """Apaga os arquivos usados há mais tempo, mantendo ``max_files``.
+
+    Arquivos temporários e os usados há menos de ``min_age`` segundos ficam.
+    """
+    files = []
+    try:
+        for path in EXPORT_DIR.iterdir():
+            if path.suffix != '.tmp':
+                files.append((path.stat().st_mtime, path))
+    except OSError:
+        return
+    files.sort(key=lambda item: item[0], reverse=True)
+    oldest = time.time() - min_age
+    for mtime, path in files[max_files:]:
+        if mtime < oldest:
+            path.unlink(missing_ok=True)
+
+
+def export(key, fmt, make_frame):
+    """Conteúdo do arquivo ``fmt`` das apostas de ``make_frame()``, gerando-o se ainda não existir."""
+    path = export_path(key, fmt)
+    # O Streamlit guarda o arquivo em memória para servi-lo ao navegador
+    try:
+        # A data de modificação marca o último uso: prune() mantém o arquivo
+        os.utime(path)
+        return path.read_bytes()
+    except FileNotFoundError:
+        # Ainda não gerado, ou apagado por prune() em outra sessão
+        pass
+
+    replace_file(path, lambda tmp_path: FORMATS[fmt][2](make_frame(), tmp_path))
+    data = path.read_bytes()
+    prune()
+    return data
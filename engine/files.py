@@ -0,0 +1,41 @@
+"""Gravação atômica de arquivos e pastas dos caches em disco.
+
+O conteúdo é gravado em um arquivo (ou pasta) temporário ao lado do destino e
+renomeado por cima dele no fim, para que leituras concorrentes, inclusive de
+outros processos, nunca vejam uma gravação pela metade. Se a gravação falhar,
+o temporário é apagado, o destino anterior fica intacto e a exceção segue.
+"""
+import os
+import shutil
+import tempfile
+
+
+def replace_file(path, write):
+    """Grava o arquivo ``path`` com ``write(caminho temporário)``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def replace_dir(path, write):
+    """Grava a pasta ``path`` com ``write(pasta temporária)``, trocando as pastas no fim."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=path.parent, prefix=f'{path.name}.')
+    try:
+        write(tmp_path)
+        # Uma pasta não pode ser renomeada por cima de outra: mover a antiga para fora antes
+        old_path = None
+        if path.exists():
+            old_path = tempfile.mkdtemp(dir=path.parent, prefix=f'{path.name}.old.')
+            os.replace(path, os.path.join(old_path, 'dados'))
+        os.replace(tmp_path, path)
+        if old_path is not None:
+            shutil.rmtree(old_path, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
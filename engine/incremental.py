@@ -0,0 +1,120 @@
+"""Atualização incremental das abas de meses em aberto.
+
+A aba do mês corrente só cresce com novas apostas (ordenadas por ``Nº``) e
+com o resultado de apostas ``Aguardando``, que muda o saldo das linhas
+seguintes. Por isso cada aba guarda o prefixo estável: as linhas anteriores à
+primeira aposta em aberto, já convertidas, com o hash do texto original.
+
+Na carga seguinte, se o prefixo do CSV tiver o mesmo hash, só as linhas a
+partir da primeira aposta em aberto (as pendentes e as novas) são convertidas
+de novo. Qualquer alteração no prefixo (uma correção antiga, linhas
+removidas) leva à conversão da aba inteira.
+
+Antes disso, cada aba guarda a última versão baixada: os validadores HTTP
+(``ETag``/``Last-Modified``), o hash do CSV e a aba convertida. Se a origem
+responder que nada mudou, ou o CSV tiver o mesmo hash, a aba convertida é
+reaproveitada sem nenhuma conversão.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+OPEN_RESULTS = {'Aguardando'}
+
+
+@dataclass(frozen=True)
+class TabState:
+    rows: int
+    digest: bytes
+    prefix: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class TabVersion:
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    frame: pd.DataFrame
+
+
+_states = {}
+_versions = {}
+_lock = threading.Lock()
+
+
+def content_digest(content):
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def last_version(key):
+    """Última versão memorizada da aba, ou None."""
+    with _lock:
+        return _versions.get(key)
+
+
+def remember_version(key, result, digest, df):
+    """Memoriza a aba convertida ``df`` com os validadores da resposta ``result``."""
+    with _lock:
+        _versions[key] = TabVersion(result.etag, result.last_modified, digest, df)
+
+
+def raw_digest(raw):
+    """Hash do texto das linhas ``raw``, sensível à ordem."""
+    hashes = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+    return hashlib.blake2b(hashes.tobytes(), digest_size=16).digest()
+
+
+def stable_rows(df, total_rows):
+    """Quantidade de linhas do CSV antes da primeira aposta em aberto.
+
+    ``df`` é a aba convertida, com o índice das linhas no CSV original.
+    """
+    if 'Resultado' not in df.columns:
+        return 0
+    is_open = df['Resultado'].isna() | df['Resultado'].isin(OPEN_RESULTS)
+    if is_open.any():
+        return int(df.index[is_open.to_numpy()][0])
+    return total_rows
+
+
+def merge_tab(key, raw, parse):
+    """Aba convertida a partir do CSV ``raw``, reaproveitando o prefixo da última carga.
+
+    ``parse`` converte as linhas do CSV (números e datas) e devolve
+    ``(df, mensagens)``, mantendo no índice a posição de cada linha no CSV.
+    Com mensagens, a aba não é memorizada. Retorna também o número de
+    linhas convertidas nesta carga.
+    """
+    raw = raw.reset_index(drop=True)
+    with _lock:
+        state = _states.get(key)
+
+    start = 0
+    if state is not None and len(raw) >= state.rows and raw_digest(raw.iloc[:state.rows]) == state.digest:
+        start = state.rows
+
+    tail, mensagens = parse(raw.iloc[start:])
+    df = pd.concat([state.prefix, tail]) if start else tail
+    if mensagens:
+        with _lock:
+            _states.pop(key, None)
+        return df, mensagens, len(raw) - start
+
+    rows = stable_rows(df, len(raw))
+    new_state = TabState(rows=rows, digest=raw_digest(raw.iloc[:rows]), prefix=df.loc[df.index < rows])
+    with _lock:
+        _states[key] = new_state
+    return df, mensagens, len(raw) - start
+
+
+def forget(key=None):
+    """Descarta o prefixo e a versão memorizados de uma aba (ou de todas)."""
+    with _lock:
+        if key is None:
+            _states.clear()
+            _versions.clear()
+        else:
+            _states.pop(key, None)
+            _versions.pop(key, None)
@@ -0,0 +1,122 @@
+"""Índice de meses sobre as apostas ordenadas por data.
+
+Com as apostas em ordem cronológica, cada mês ocupa um intervalo contíguo de
+linhas. Selecionar um conjunto de meses vira o fatiamento desses intervalos,
+em vez de comparar a coluna de mês linha a linha em cada rerun.
+
+As apostas podem ficar em mais de um frame (``pieces``), um depois do outro:
+o histórico dos meses encerrados e as abas em aberto. Acrescentar as abas
+em aberto (``append``) não copia o histórico; só os meses selecionados são
+reunidos, em ``select``. As posições das linhas (os intervalos dos meses e o
+índice dos frames devolvidos) contam todas as partes em sequência.
+"""
+from functools import cached_property
+
+import numpy as np
+
+from engine.schema import MONTH_KEY, concat_frames
+
+
+def month_ranges(keys, offset=0):
+    """Intervalo ``[início, fim)`` de cada chave de mês em ``keys``, somando ``offset``."""
+    if len(keys) == 0:
+        return {}
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.append(starts[1:], len(keys))
+    return {int(keys[start]): (int(start) + offset, int(end) + offset) for start, end in zip(starts, ends)}
+
+
+class MonthIndex:
+    """Apostas em ordem cronológica com o intervalo ``[início, fim)`` de cada mês.
+
+    Com ``presorted`` as apostas já estão em ordem e só o índice é refeito.
+    """
+
+    def __init__(self, df, presorted=False):
+        if not presorted:
+            df = df.sort_values('Data', kind='stable')
+        df = df.reset_index(drop=True)
+        self.pieces = [df]
+        self.offsets = [0]
+        self.ranges = month_ranges(df[MONTH_KEY].to_numpy())
+
+    def __len__(self):
+        return self.offsets[-1] + len(self.pieces[-1])
+
+    def append(self, other):
+        """Novo índice com as apostas de ``other``, todas de meses posteriores, depois destas.
+
+        As partes dos dois índices são reaproveitadas, sem copiar as linhas.
+        """
+        if self.ranges and other.ranges and other.keys[0] <= self.keys[-1]:
+            raise ValueError("as apostas acrescentadas devem ser de meses posteriores")
+        index = object.__new__(type(self))
+        index.pieces = self.pieces + other.pieces
+        index.offsets = self.offsets + [len(self) + offset for offset in other.offsets]
+        index.ranges = {**self.ranges,
+                        **{key: (start + len(self), end + len(self)) for key, (start, end) in other.ranges.items()}}
+        return index
+
+    def prefix(self, rows):
+        """Índice com as ``rows`` primeiras apostas; as partes inteiras são reaproveitadas."""
+        index = object.__new__(type(self))
+        index.pieces, index.offsets = [], []
+        for piece, offset in zip(self.pieces, self.offsets):
+            if offset >= rows and index.pieces:
+                break
+            index.pieces.append(piece if offset + len(piece) <= rows else piece.iloc[:rows - offset])
+            index.offsets.append(offset)
+        index.ranges = {key: (start, min(end, rows)) for key, (start, end) in self.ranges.items() if start < rows}
+        return index
+
+    @cached_property
+    def df(self):
+        """Todas as apostas em um frame; com mais de uma parte, elas são concatenadas (cópia)."""
+        if len(self.pieces) == 1:
+            return self.pieces[0]
+        return concat_frames(self.pieces)
+
+    @property
+    def keys(self):
+        """Chaves dos meses disponíveis, em ordem cronológica."""
+        return list(self.ranges)
+
+    def row_ranges(self, keys):
+        """Intervalos de linhas dos meses pedidos, com meses vizinhos unidos em um só."""
+        merged = []
+        for key in sorted(set(keys)):
+            if key not in self.ranges:
+                continue
+            start, end = self.ranges[key]
+            if merged and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def select(self, keys):
+        """Apostas dos meses pedidos, em ordem cronológica, indexadas pela posição.
+
+        Meses consecutivos (como todos os de um "Acumulado <ano>") de uma mesma
+        parte resultam em uma única fatia; caso contrário as fatias de cada
+        parte são reunidas com ``take`` e as das partes, concatenadas.
+        """
+        ranges = self.row_ranges(keys)
+        frames = []
+        for piece, offset in zip(self.pieces, self.offsets):
+            # Intervalos dentro desta parte, em posições locais
+            end_of_piece = offset + len(piece)
+            local = [(max(start, offset) - offset, min(end, end_of_piece) - offset)
+                     for start, end in ranges if start < end_of_piece and end > offset]
+            if not local:
+                continue
+            if len(local) == 1:
+                frame = piece.iloc[local[0][0]:local[0][1]]
+            else:
+                frame = piece.take(np.concatenate([np.arange(start, end) for start, end in local]))
+            frames.append(frame.set_axis(frame.index + offset) if offset else frame)
+        if not frames:
+            return self.pieces[0].iloc[0:0]
+        if len(frames) == 1:
+            return frames[0]
+        return concat_frames(frames).set_axis(np.concatenate([frame.index.to_numpy() for frame in frames]))
@@ -0,0 +1,233 @@
+"""Carga das abas mensais do Google Sheets: download, conversão e concatenação."""
+import io
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from engine import cache, incremental, sources, store
+from engine.singleflight import SingleFlight
+from engine.config import NUMERIC_COLUMNS
+from engine.parsing import parse_sheet_dates, to_numeric_br
+from engine.months import sheet_key
+from engine.schema import ROW_KEY, TAB_KEY, apply_schema, concat_frames, memory_report
+from engine.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Limite de downloads simultâneos e tempo máximo (em segundos) de cada requisição
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 30
+
+# Tipo das colunas de valores (Stake, L/P, Saldo); 'float32' reduz a memória à metade,
+# ao custo de arredondamentos no saldo acumulado de históricos longos
+MONEY_DTYPE = 'float64'
+
+# Origem de cada aba carregada: cópia em disco de mês encerrado, sem mudanças desde a
+# última carga, baixada e convertida, cópia local após falha no download, ou erro
+TAB_STATUSES = ('disco', 'inalterada', 'baixada', 'reserva', 'erro')
+
+# Total de abas por origem desde o início do processo
+LOAD_STATS = Counter()
+_stats_lock = threading.Lock()
+
+_inflight = SingleFlight()
+
+
+def parse_tab(df, config, sheet_name):
+    """Converte os números e as datas das linhas de uma aba; retorna ``(df, mensagens)``."""
+    mensagens = []
+
+    # Converter colunas numéricas
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = to_numeric_br(df[col])
+
+    # Converter a coluna Data para datetime
+    if 'Data' in df.columns:
+        try:
+            # O ano vem do nome da aba (ex: "Maio/23" -> 2023)
+            year = int(sheet_name.split('/')[1]) + 2000  # Converte "23" para 2023, "24" para 2024, etc.
+            dates = parse_sheet_dates(df['Data'], config.date_format, year)
+            # Nenhuma data preenchida no formato esperado: a aba inteira seria descartada em silêncio
+            filled = df['Data'].astype('string').str.strip().fillna('') != ''
+            if filled.any() and dates[filled].isna().all():
+                mensagens.append(('warning', f"Aviso: As datas da aba {sheet_name} não estão no formato "
+                                             f"{config.date_format} (ex: {df['Data'][filled].iloc[0]})"))
+            df['Data'] = dates
+            # Remover linhas com datas inválidas
+            df = df.dropna(subset=['Data'])
+        except Exception as e:
+            mensagens.append(('warning', f"Aviso: Erro ao converter datas na aba {sheet_name}: {e}"))
+    return df, mensagens
+
+
+# Função para carregar dados do Google Sheets
+# Retorna o DataFrame (ou None) e a lista de mensagens (nível, texto) a exibir,
+# pois chamadas st.* feitas dentro das threads de download não aparecem na página.
+# O CSV vem da origem configurada em engine.sources (por padrão, o endpoint gviz)
+def load_google_sheets(config, sheet_name, timeout=REQUEST_TIMEOUT):
+    df, mensagens, _ = load_tab(config, sheet_name, timeout)
+    return df, mensagens
+
+
+# Como load_google_sheets, informando também de onde veio a aba (um de TAB_STATUSES)
+def load_tab(config, sheet_name, timeout=REQUEST_TIMEOUT):
+    sheet_id = cache.sheet_id_from_url(config.sheet_url)
+
+    # Meses encerrados não mudam mais: usar a cópia em disco, se gravada depois do encerramento
+    if cache.is_closed(sheet_name):
+        df = cache.read_closed(sheet_id, sheet_name)
+        if df is not None:
+            return df, [], 'disco'
+
+    # Pedidos simultâneos da mesma aba (sessões, atualização em segundo plano)
+    # compartilham um único download e conversão
+    key = (sheet_id, sheet_name)
+    (df, mensagens, status), shared = _inflight.do(key, lambda: fetch_tab(config, key, timeout))
+    if shared:
+        logger.debug("Aba %s: resultado compartilhado com outra carga em andamento", sheet_name)
+    return df, mensagens, status
+
+
+# Baixar e converter uma aba em aberto, reaproveitando o que não mudou desde a última carga
+def fetch_tab(config, key, timeout):
+    sheet_id, sheet_name = key
+    try:
+        # Com os validadores da última versão, a origem pode responder que a aba não mudou
+        version = incremental.last_version(key)
+        result = sources.get_source().fetch(sheet_id, sheet_name, timeout,
+                                            etag=version and version.etag,
+                                            last_modified=version and version.last_modified)
+        if result.not_modified:
+            return unchanged_tab(key, version.frame)
+        digest = incremental.content_digest(result.content)
+        if version is not None and digest == version.digest:
+            incremental.remember_version(key, result, digest, version.frame)
+            return unchanged_tab(key, version.frame)
+
+        raw = pd.read_csv(io.BytesIO(result.content), encoding='utf-8')
+        raw = raw[list(config.columns)].rename(columns=config.column_names)
+
+        # Só as linhas novas e as apostas ainda em aberto são convertidas de novo
+        df, mensagens, parsed = incremental.merge_tab(
+            key, raw, lambda rows: parse_tab(rows, config, sheet_name))
+        logger.debug("Aba %s: %d de %d linhas convertidas", sheet_name, parsed, len(raw))
+
+        if not mensagens:
+            cache.write(sheet_id, sheet_name, df)
+            incremental.remember_version(key, result, digest, df)
+        return df, mensagens, 'baixada'
+    except Exception as e:
+        mensagens = []
+        # Sem acesso à planilha: usar a última cópia salva, se houver
+        df = cache.read(sheet_id, sheet_name)
+        if df is not None:
+            mensagens.append(('warning', f"Aviso: usando cópia local da aba {sheet_name} ({e})"))
+            return df, mensagens, 'reserva'
+        mensagens.append(('error', f"Erro ao carregar a planilha {sheet_name}: {e}"))
+        return None, mensagens, 'erro'
+
+
+# Aba igual à última carga. Se o mês já encerrou, a cópia em disco é regravada:
+# gravada agora, depois do encerramento, ela passa a ser lida sem baixar a aba
+def unchanged_tab(key, df):
+    sheet_id, sheet_name = key
+    if cache.is_closed(sheet_name):
+        cache.write(sheet_id, sheet_name, df)
+    return df, [], 'inalterada'
+
+
+# Carregar as abas em paralelo, mantendo a ordem dos meses no resultado.
+# Retorna as abas com apostas, as mensagens e os nomes das abas que não carregaram
+def load_all_sheets(config, sheet_names, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda name: load_tab(config, name, timeout), sheet_names))
+
+    dfs = []
+    mensagens = []
+    failed = []
+    statuses = Counter()
+    for sheet_name, (df, avisos, status) in zip(sheet_names, results):
+        mensagens.extend(avisos)
+        statuses[status] += 1
+        if df is None:
+            failed.append(sheet_name)
+        # Abas sem apostas (um mês novo só com linhas em branco) não entram na concatenação
+        if df is not None and not df.empty:
+            # O índice de cada aba é a posição da linha no CSV
+            dfs.append(df.assign(**{TAB_KEY: sheet_key(sheet_name), ROW_KEY: df.index.to_numpy()}))
+
+    with _stats_lock:
+        LOAD_STATS.update(statuses)
+    if statuses:
+        logger.info("Abas de %s: %s", config.key,
+                    ", ".join(f"{statuses[status]} {status}" for status in TAB_STATUSES if statuses[status]))
+    return dfs, mensagens, tuple(failed)
+
+
+def clean_data(df, config):
+    # Histórico e abas em aberto são limpos separadamente: nenhuma coluna é removida
+    # aqui, mesmo vazia, para que as partes tenham sempre as mesmas colunas
+
+    # Substituir as palavras na coluna 'Mercado' (texto mesmo se a coluna vier vazia)
+    df['Mercado'] = df['Mercado'].astype('string').str.strip()
+    for old, new in config.market_renames:
+        df['Mercado'] = df['Mercado'].str.replace(old, new, case=False)
+
+    # Tipos compactos e chave inteira do mês para os filtros de período
+    compact = apply_schema(df, money_dtype=MONEY_DTYPE)
+    if logger.isEnabledFor(logging.INFO):
+        report = memory_report(df, compact)
+        logger.info("Memória dos dados de %s: %.1f MB -> %.1f MB", config.key,
+                    report.loc['total', 'antes'] / 1e6, report.loc['total', 'depois'] / 1e6)
+    return compact
+
+
+def has_errors(mensagens):
+    return any(nivel == 'error' for nivel, _ in mensagens)
+
+
+# Histórico dos meses encerrados: abas concatenadas, limpas e indexadas em um snapshot.
+# Lido do dataset Parquet de engine.store se ele tiver sido gravado com as mesmas abas.
+# Retorna o snapshot, as mensagens e as abas que não carregaram (para load_missing)
+def load_history(config, sheet_names):
+    df = store.read(config.key, sheet_names)
+    if df is not None:
+        return Snapshot.build(df), [], ()
+
+    dfs, mensagens, failed = load_all_sheets(config, sheet_names)
+    if not dfs:
+        return None, mensagens, failed
+    df = clean_data(pd.concat(dfs, ignore_index=True), config)
+    # Só gravar o histórico se todas as abas vieram sem avisos (nenhuma cópia de reserva)
+    if not mensagens:
+        store.write(config.key, df, sheet_names)
+    return Snapshot.build(df), mensagens, failed
+
+
+# Baixar de novo só as abas ``missing`` que faltaram no histórico e juntá-las a ele.
+# O histórico assim completado não é gravado em engine.store: só cargas completas são
+def load_missing(config, history, missing):
+    dfs, mensagens, failed = load_all_sheets(config, missing)
+    if not dfs:
+        return history, mensagens, failed
+
+    parts = [history.index.df] if history is not None else []
+    df = concat_frames([*parts, clean_data(pd.concat(dfs, ignore_index=True), config)])
+    # As abas recuperadas podem ser de meses no meio do histórico: mesma ordem de
+    # uma carga completa (por data e, no mesmo dia, pela ordem das abas e linhas)
+    df = df.sort_values(['Data', TAB_KEY, ROW_KEY], kind='stable', ignore_index=True)
+    return Snapshot.build(df, presorted=True), mensagens, failed
+
+
+# Carregar as abas em aberto, limpar e juntar ao histórico dos meses encerrados
+def load_recent(config, sheet_names, history):
+    dfs, mensagens, _ = load_all_sheets(config, sheet_names)
+    if not dfs:
+        return history, mensagens
+
+    recent = clean_data(pd.concat(dfs, ignore_index=True), config)
+    return Snapshot.extend(history, recent), mensagens
@@ -0,0 +1,58 @@
+"""Nomes de meses em português e geração dos nomes das abas mensais ("Maio/23")."""
+from datetime import datetime
+
+# Mapping of Portuguese month names to month numbers
+month_map = {
+    "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4,
+    "Maio": 5, "Junho": 6, "Julho": 7, "Agosto": 8,
+    "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
+}
+
+months_pt = {number: name for name, number in month_map.items()}
+
+
+# Function to parse "Mês/Ano" strings into datetime objects
+def parse_month_year(month_year_str):
+    try:
+        month_name, year = month_year_str.split('/')
+        month = month_map[month_name]
+        year = int(year) + 2000  # Convert "23" to 2023, "24" to 2024, etc.
+        return datetime(year, month, 1)
+    except (ValueError, KeyError):
+        return None
+
+
+# Chave inteira do mês de uma aba ("Maio/23" -> 2023 * 12 + 4), ou None
+def sheet_key(sheet_name):
+    date = parse_month_year(sheet_name)
+    return date.year * 12 + date.month - 1 if date is not None else None
+
+
+# Obter o nome do mês em português
+def get_month_name(month_number):
+    return months_pt.get(month_number, "Mês Inválido")
+
+
+def month_label(year, month):
+    return f"{get_month_name(month)}/{str(year)[-2:]}"
+
+
+# Rótulo "Mês/Ano" de uma chave inteira de mês (ano * 12 + mês - 1)
+def month_key_label(key):
+    year, month_index = divmod(int(key), 12)
+    return month_label(year, month_index + 1)
+
+
+# Gerar a lista de abas desde o mês inicial até o mês atual
+def generate_sheet_names(start_month, start_year, current_date=None):
+    current_date = current_date or datetime.now()
+    current_month = current_date.month
+    current_year = current_date.year
+
+    sheet_names = []
+    for year in range(start_year, current_year + 1):
+        start_m = start_month if year == start_year else 1
+        end_m = current_month if year == current_year else 12
+        for month in range(start_m, end_m + 1):
+            sheet_names.append(month_label(year, month))
+    return sheet_names
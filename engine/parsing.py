@@ -0,0 +1,48 @@
+"""Conversões vetorizadas das colunas lidas das planilhas."""
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+
+def to_numeric_br(series):
+    """Converte uma coluna de números em formato brasileiro para float64.
+
+    Aceita ``"1,85"``, ``"1.234,56"``, ``"R$ 1.234,56"``, ``"-0,5"`` e também
+    valores já em formato americano (``"1.85"``). Quando há vírgula ela é o
+    separador decimal e os pontos são de milhar; sem vírgula, um único ponto
+    é decimal. Valores que não puderem ser convertidos viram NaN.
+    """
+    if is_numeric_dtype(series):
+        return series.astype('float64')
+
+    values = series.astype('string').str.replace('R$', '', regex=False).str.strip()
+    has_comma = values.str.contains(',', regex=False, na=False)
+    if has_comma.any():
+        # Com vírgula decimal, os pontos são separadores de milhar
+        decimal = values.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        values = decimal if has_comma.all() else decimal.where(has_comma, values)
+
+    try:
+        return values.astype('float64')
+    except (TypeError, ValueError):
+        # Há valores inválidos na coluna: seguir pelo caminho mais lento, que os converte em NaN
+        thousands_only = ~has_comma & (values.str.count(r'\.') > 1)
+        values = values.mask(thousands_only, values.str.replace('.', '', regex=False))
+        return pd.to_numeric(values, errors='coerce').astype('float64')
+
+
+def parse_sheet_dates(series, date_format, year):
+    """Converte a coluna Data de uma aba em datetime64, usando o ano da aba.
+
+    Sem ano no formato (``'%d/%m'``), o ano da aba é acrescentado ao texto
+    antes da conversão, para que 29/02 de anos bissextos seja aceito. Com ano
+    (``'%d/%m/%y'``), as datas são remontadas com ``pd.to_datetime`` sobre um
+    frame de componentes, trocando o ano da célula pelo da aba. Datas
+    inválidas viram NaT.
+    """
+    values = series.astype('string').str.strip()
+    if '%y' not in date_format and '%Y' not in date_format:
+        return pd.to_datetime(values + f"/{year}", format=f"{date_format}/%Y", errors='coerce')
+
+    dates = pd.to_datetime(values, format=date_format, errors='coerce')
+    components = pd.DataFrame({'year': year, 'month': dates.dt.month, 'day': dates.dt.day})
+    return pd.to_datetime(components, errors='coerce')
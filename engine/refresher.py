@@ -0,0 +1,246 @@
+"""Snapshots dos dashboards mantidos em memória por uma thread em segundo plano.
+
+Um único ``Refresher`` por processo (criado com ``st.cache_resource``) guarda
+o snapshot mais recente de cada dashboard. A thread carrega todos os
+dashboards ao iniciar e, a cada ``REFRESH_INTERVAL`` segundos, baixa de novo
+as abas em aberto e troca o snapshot pelo novo, de uma vez. Os reruns das
+sessões só leem o snapshot já pronto; apenas o primeiro acesso a um dashboard
+que a thread ainda não carregou espera pela carga.
+
+Uma atualização que falha (abas com erro) não substitui o último snapshot
+bom: ele continua sendo exibido, com a idade e a falha indicadas na barra
+lateral. Atualizações pedidas pelas sessões (o botão "Atualizar dados", um
+snapshot mais velho que ``STALE_AFTER`` ou, passados ``RETRY_AFTER``
+segundos da última tentativa, com abas que falharam) rodam em segundo plano;
+o novo snapshot aparece no rerun seguinte. Se nenhum dado pôde ser carregado,
+o primeiro acesso depois de ``RETRY_AFTER`` segundos tenta a carga de novo.
+Abas encerradas que falharam são baixadas de novo sozinhas: o restante do
+histórico fica em memória.
+
+Cada snapshot novo é publicado por ``engine.shared`` em um arquivo Arrow
+mapeado em memória. Outros processos que encontram uma publicação mais
+recente que ``REFRESH_INTERVAL`` a usam em vez de baixar as planilhas (o
+botão "Atualizar dados" sempre baixa).
+
+Os snapshots são compartilhados entre sessões e não devem ser alterados.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+
+import streamlit as st
+
+from engine import cache, shared
+from engine.config import DASHBOARDS
+from engine.loader import has_errors, load_history, load_missing, load_recent
+from engine.months import generate_sheet_names, sheet_key
+from engine.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (em segundos) entre as atualizações das abas em aberto
+REFRESH_INTERVAL = 600
+
+# Idade (em segundos) a partir da qual um acesso pede uma atualização, caso a
+# atualização periódica esteja atrasada
+STALE_AFTER = 2 * REFRESH_INTERVAL
+
+# Intervalo mínimo (em segundos) entre novas tentativas de um snapshot incompleto;
+# uma aba que continua faltando (um mês ainda sem aba) não gera um download a cada rerun
+RETRY_AFTER = 60
+
+
+@dataclass(frozen=True)
+class Entry:
+    """Snapshot de um dashboard, com as mensagens da carga que o gerou.
+
+    ``updated_at`` é o momento da carga do snapshot; ``checked_at``, o da
+    última tentativa de atualização, e ``failed``, os erros dela se falhou.
+    """
+    snapshot: Snapshot | None
+    mensagens: tuple
+    updated_at: float
+    checked_at: float
+    failed: tuple = ()
+
+    @property
+    def age(self):
+        return time.time() - self.updated_at
+
+    @property
+    def incomplete(self):
+        """Sem snapshot, com abas que não carregaram ou com a última atualização falha."""
+        return self.snapshot is None or bool(self.failed) or has_errors(self.mensagens)
+
+
+class Refresher:
+    def __init__(self, configs, interval=REFRESH_INTERVAL, retry_after=RETRY_AFTER):
+        self.configs = dict(configs)
+        self.interval = interval
+        self.retry_after = retry_after
+        self._entries = {}
+        # Histórico dos meses encerrados de cada dashboard: (abas, snapshot, abas que faltaram)
+        self._history = {}
+        # Uma carga por dashboard por vez
+        self._locks = {key: threading.Lock() for key in self.configs}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='dashboard-refresher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def get(self, config):
+        """Último snapshot do dashboard, carregando-o se ainda não houver.
+
+        Sem snapshot (ainda não carregado, ou a carga anterior falhou por
+        inteiro há mais de ``retry_after`` segundos), a carga é feita agora.
+        Um snapshot antigo, ou incompleto há mais de ``retry_after`` segundos,
+        é devolvido assim mesmo, pedindo uma atualização em segundo plano.
+        """
+        entry = self._entries.get(config.key)
+        if entry is None or (entry.snapshot is None and self._retry_due(entry)):
+            with self._locks[config.key]:
+                current = self._entries.get(config.key)
+                # Só carregar se ninguém o fez enquanto esperávamos
+                if current is entry:
+                    current = self._refresh(config, force=False)
+                entry = current
+        elif entry.snapshot is not None and (
+                self._retry_due(entry) if entry.incomplete else time.time() - entry.checked_at > STALE_AFTER):
+            self.refresh_async(config)
+        return entry
+
+    def _retry_due(self, entry):
+        return time.time() - entry.checked_at >= self.retry_after
+
+    def is_refreshing(self, config):
+        return self._locks[config.key].locked()
+
+    def refresh_async(self, config, force=False):
+        """Inicia a atualização do dashboard em segundo plano, se nenhuma estiver em andamento."""
+        lock = self._locks[config.key]
+        if not lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self._refresh(config, force)
+            except Exception:
+                logger.exception("Falha ao atualizar os dados de %s", config.key)
+            finally:
+                lock.release()
+
+        threading.Thread(target=run, name=f'refresh-{config.key}', daemon=True).start()
+        return True
+
+    def refresh(self, config, force=False):
+        """Recarrega as abas em aberto do dashboard agora e devolve o novo snapshot.
+
+        Sem ``force``, um snapshot publicado por outro processo há menos de
+        ``interval`` segundos é usado no lugar do download.
+        """
+        with self._locks[config.key]:
+            return self._refresh(config, force)
+
+    def _refresh(self, config, force=True):
+        sheet_names = generate_sheet_names(config.start_month, config.start_year)
+        closed = tuple(name for name in sheet_names if cache.is_closed(name))
+
+        if not force:
+            entry = self._adopt(config, closed)
+            if entry is not None:
+                return entry
+
+        mensagens = []
+        history_names, history, missing = self._history.get(config.key, (None, None, ()))
+        if history_names != closed:
+            history, mensagens, missing = load_history(config, closed)
+        elif missing:
+            # Histórico com abas faltando: só elas são baixadas de novo
+            history, mensagens, missing = load_missing(config, history, missing)
+        self._history[config.key] = (closed, history, missing)
+
+        snapshot, avisos = load_recent(config, [name for name in sheet_names if name not in closed], history)
+        mensagens = tuple(mensagens + avisos)
+        now = time.time()
+
+        previous = self._entries.get(config.key)
+        if has_errors(mensagens) and previous is not None and previous.snapshot is not None:
+            # Continuar exibindo o último snapshot bom
+            failed = tuple(texto for nivel, texto in mensagens if nivel == 'error')
+            logger.warning("Atualização de %s falhou; mantendo os dados anteriores: %s", config.key, failed)
+            entry = replace(previous, checked_at=now, failed=failed)
+        else:
+            entry = Entry(snapshot, mensagens, now, now)
+            if snapshot is not None and not has_errors(mensagens) and shared.publish(config.key, snapshot, mensagens):
+                # Usar a versão publicada, mapeada em memória, no lugar da cópia do processo
+                entry = self._open_published(config, closed) or entry
+        # Troca atômica: quem já leu o snapshot anterior continua com ele
+        self._entries[config.key] = entry
+        return entry
+
+    def _adopt(self, config, closed):
+        """Usa o snapshot publicado por outro processo, se for recente e mais novo que o atual."""
+        published = shared.published_at(config.key)
+        if published is None or time.time() - published >= self.interval:
+            return None
+        current = self._entries.get(config.key)
+        if current is not None and current.updated_at >= published:
+            return None
+        entry = self._open_published(config, closed)
+        if entry is not None:
+            self._entries[config.key] = entry
+        return entry
+
+    def _open_published(self, config, closed):
+        published = shared.published_at(config.key)
+        opened = shared.open_published(config.key)
+        if published is None or opened is None:
+            return None
+        snapshot, mensagens = opened
+
+        # O histórico da próxima atualização passa a ser uma fatia do arquivo mapeado,
+        # com as apostas lidas das abas encerradas
+        last_closed = sheet_key(closed[-1]) if closed else None
+        history = snapshot.until(last_closed) if last_closed is not None else None
+        if history is not None:
+            self._history[config.key] = (closed, history, ())
+        return Entry(snapshot, mensagens, published, time.time())
+
+    def _run(self):
+        # Primeira passada: carregar os dashboards que nenhuma sessão carregou ainda
+        update = self.get
+        while True:
+            for config in self.configs.values():
+                try:
+                    update(config)
+                except Exception:
+                    logger.exception("Falha ao atualizar os dados de %s", config.key)
+            update = self.refresh
+            if self._stop.wait(self.interval):
+                return
+
+
+@st.cache_resource(show_spinner=False)
+def get_refresher():
+    refresher = Refresher(DASHBOARDS)
+    refresher.start()
+    return refresher
+
+
+def load_dashboard_data(config):
+    """``Entry`` com o último snapshot do dashboard e as mensagens da carga."""
+    return get_refresher().get(config)
+
+
+def refresh_dashboard_data(config):
+    """Pede a atualização do dashboard em segundo plano, sem esperar a periódica."""
+    get_refresher().refresh_async(config, force=True)
+
+
+def is_refreshing(config):
+    return get_refresher().is_refreshing(config)
@@ -0,0 +1,82 @@
+"""Tipos compactos aplicados às apostas depois da concatenação das abas.
+
+Colunas de baixa cardinalidade viram ``category`` (filtros como
+``df['Resultado'] == 'Ganha'`` passam a comparar códigos inteiros), o mês de
+cada aposta vira a chave inteira ``Mês`` (``ano * 12 + mês - 1``) e, se
+pedido, as colunas de valores passam a ``float32``.
+"""
+import pandas as pd
+
+from engine.config import PROFIT, STAKE
+
+CATEGORY_COLUMNS = ['Mercado', 'Resultado', 'País', 'Liga']
+MONEY_COLUMNS = [STAKE, PROFIT, 'Saldo']
+
+# Coluna com a chave inteira do mês, usada pelos filtros de período
+MONTH_KEY = 'Mês'
+
+# Aba de origem de cada aposta (chave do mês da aba, que pode diferir do mês da
+# data) e a posição da linha na aba: juntas, dão a ordem da planilha
+TAB_KEY = 'Aba'
+ROW_KEY = 'Linha'
+
+# Colunas calculadas uma vez por snapshot (engine.snapshot): o L/P acumulado dentro
+# do mês da aposta e as cores da tabela para Resultado e Saldo
+MONTH_CUMSUM = 'Acumulado do mês'
+RESULT_COLOR = 'Cor do resultado'
+BALANCE_COLOR = 'Cor do saldo'
+DERIVED_COLUMNS = [MONTH_CUMSUM, RESULT_COLOR, BALANCE_COLOR]
+
+# Colunas usadas só internamente, fora da tabela e dos downloads
+INTERNAL_COLUMNS = [MONTH_KEY, TAB_KEY, ROW_KEY, *DERIVED_COLUMNS]
+
+
+def month_keys(dates):
+    """Chave inteira do mês de cada data (``ano * 12 + mês - 1``)."""
+    return (dates.dt.year * 12 + dates.dt.month - 1).astype('int32')
+
+
+def apply_schema(df, money_dtype='float64'):
+    """Retorna uma cópia de ``df`` com os tipos compactos e a coluna ``Mês``."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in MONEY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(money_dtype)
+    if 'Nº' in df.columns:
+        df['Nº'] = pd.to_numeric(df['Nº'], errors='coerce').astype('Int32')
+    for col in (TAB_KEY, ROW_KEY):
+        if col in df.columns:
+            df[col] = df[col].astype('int32')
+    df[MONTH_KEY] = month_keys(df['Data'])
+    return df
+
+
+def concat_frames(frames):
+    """Concatena frames com ``apply_schema`` mantendo as colunas ``category``.
+
+    ``pd.concat`` só preserva ``category`` quando as categorias são idênticas;
+    aqui elas são unidas antes, em vez de a coluna virar ``object``.
+    """
+    frames = list(frames)
+    for col in CATEGORY_COLUMNS:
+        if not all(col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames):
+            continue
+        categories = frames[0][col].cat.categories
+        for df in frames[1:]:
+            categories = categories.union(df[col].cat.categories, sort=False)
+        frames = [df.assign(**{col: df[col].cat.set_categories(categories)}) for df in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(before, after):
+    """Uso de memória (bytes) por coluna antes e depois de ``apply_schema``."""
+    report = pd.DataFrame({
+        'antes': before.memory_usage(deep=True, index=False),
+        'depois': after.memory_usage(deep=True, index=False),
+    }).reindex(after.columns)
+    report.loc['total'] = report.sum()
+    report['redução'] = 1 - report['depois'] / report['antes']
+    return report
@@ -0,0 +1,104 @@
+"""Snapshots publicados em arquivos Arrow IPC, compartilhados entre processos.
+
+Cada atualização bem-sucedida grava as apostas do snapshot em
+``.cache/snapshots/<dashboard>.arrow`` (arquivo temporário renomeado por
+cima do anterior) e o processo passa a usar o arquivo mapeado em memória.
+Outros processos do Streamlit (réplicas atrás de um balanceador) abrem o
+mesmo arquivo em vez de baixar as planilhas de novo: as páginas do arquivo
+ficam no cache do sistema operacional, uma única vez para todos.
+
+O arquivo não é comprimido, para que as colunas numéricas, de datas e de
+texto sejam lidas sem cópia. Um processo que já mapeou o arquivo continua
+com a versão anterior até abrir a nova.
+
+Além das apostas (com as colunas calculadas do snapshot, como o acumulado do
+mês e as cores), o arquivo leva o resumo mensal nos metadados: abri-lo só
+refaz o índice dos meses, sem resumir nem colorir o histórico de novo.
+Gravar o arquivo continua proporcional à quantidade de apostas.
+"""
+import json
+import logging
+import shutil
+
+import pyarrow as pa
+
+from engine.cache import CACHE_DIR
+from engine.files import replace_file
+from engine.index import MonthIndex
+from engine.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = CACHE_DIR.parent / 'snapshots'
+
+
+def snapshot_path(dashboard_key):
+    return SNAPSHOT_DIR / f'{dashboard_key}.arrow'
+
+
+def published_at(dashboard_key):
+    """Momento (``time.time()``) da última publicação do dashboard, ou None."""
+    try:
+        return snapshot_path(dashboard_key).stat().st_mtime
+    except OSError:
+        return None
+
+
+def publish(dashboard_key, snapshot, mensagens):
+    """Grava o snapshot e as mensagens da carga. Retorna False se a gravação falhar."""
+    def write_table(tmp_path):
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    try:
+        # Cada parte do snapshot vira um bloco do arquivo, sem concatenar as apostas em
+        # pandas; as categorias das partes são unidas em um único dicionário por coluna
+        tables = [pa.Table.from_pandas(piece, preserve_index=False) for piece in snapshot.index.pieces]
+        table = pa.concat_tables(tables, promote_options='permissive').unify_dictionaries()
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'mensagens'] = json.dumps(list(mensagens), ensure_ascii=False).encode('utf-8')
+        metadata[b'resumo'] = summary_bytes(snapshot.summary)
+        table = table.replace_schema_metadata(metadata)
+        replace_file(snapshot_path(dashboard_key), write_table)
+        return True
+    except Exception:
+        logger.warning("Falha ao publicar o snapshot de %s", dashboard_key, exc_info=True)
+        return False
+
+
+def summary_bytes(summary):
+    """Resumo mensal em um stream Arrow IPC, com o índice dos meses."""
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(summary)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_summary(data):
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+def invalidate(dashboard_key=None):
+    """Remove o snapshot publicado de um dashboard (ou de todos)."""
+    if dashboard_key is None:
+        shutil.rmtree(SNAPSHOT_DIR, ignore_errors=True)
+    else:
+        snapshot_path(dashboard_key).unlink(missing_ok=True)
+
+
+def open_published(dashboard_key):
+    """``(snapshot, mensagens)`` do arquivo publicado, mapeado em memória, ou None."""
+    try:
+        source = pa.memory_map(str(snapshot_path(dashboard_key)))
+        table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadata = table.schema.metadata or {}
+    mensagens = tuple(tuple(mensagem) for mensagem in json.loads(metadata.get(b'mensagens', b'[]')))
+    # split_blocks mantém cada coluna no seu próprio buffer, sem consolidar (copiar) as numéricas
+    df = table.to_pandas(split_blocks=True)
+    if b'resumo' not in metadata:
+        # Arquivo sem o resumo (gravado por uma versão anterior): montar o snapshot
+        return Snapshot.build(df, presorted=True), mensagens
+    return Snapshot(index=MonthIndex(df, presorted=True), summary=read_summary(metadata[b'resumo'])), mensagens
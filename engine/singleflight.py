@@ -0,0 +1,50 @@
+"""Execução única de chamadas simultâneas com a mesma chave.
+
+Enquanto uma chamada com a chave ``k`` está em andamento, as outras threads
+que pedem ``k`` esperam por ela e recebem o mesmo resultado (ou a mesma
+exceção), em vez de repetir o trabalho. Terminada a chamada, a chave é
+liberada: o próximo pedido executa de novo.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Executa ``fn()`` uma única vez por chave em andamento.
+
+        Retorna ``(resultado, compartilhado)``, em que ``compartilhado`` indica
+        que o resultado veio da chamada de outra thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
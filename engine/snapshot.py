@@ -0,0 +1,95 @@
+"""Dados de um dashboard prontos para consulta: apostas indexadas por mês e resumo mensal.
+
+Ao montar um snapshot, cada aposta recebe as colunas de ``DERIVED_COLUMNS``:
+o L/P acumulado dentro do seu mês e as cores da tabela. Como só dependem da
+aposta e das anteriores do mesmo mês, elas continuam valendo quando outras
+apostas, de meses posteriores, são acrescentadas.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from engine.balance import month_cumsum
+from engine.index import MonthIndex
+from engine.schema import BALANCE_COLOR, DERIVED_COLUMNS, MONTH_CUMSUM, MONTH_KEY, RESULT_COLOR, TAB_KEY, \
+    concat_frames
+from engine.styles import style_map
+from engine.summary import monthly_summary
+
+
+def with_derived_columns(df):
+    """``df`` (em ordem cronológica) com as colunas de ``DERIVED_COLUMNS`` calculadas."""
+    df = df.drop(columns=DERIVED_COLUMNS, errors='ignore')
+    derived = {}
+    cumsum = month_cumsum(df)
+    if cumsum is not None:
+        derived[MONTH_CUMSUM] = cumsum
+    colors = style_map(df)
+    if colors is not None:
+        derived[RESULT_COLOR] = colors['Resultado']
+        derived[BALANCE_COLOR] = colors['Saldo']
+    return df.assign(**derived)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    index: MonthIndex
+    summary: pd.DataFrame
+
+    @classmethod
+    def build(cls, df, presorted=False):
+        if not presorted:
+            df = df.sort_values('Data', kind='stable')
+        df = with_derived_columns(df.reset_index(drop=True))
+        return cls(index=MonthIndex(df, presorted=True), summary=monthly_summary(df))
+
+    def until(self, key):
+        """Snapshot só com as apostas lidas das abas até a chave ``key``, ou None sem ``TAB_KEY``.
+
+        A aba de cada aposta vem de ``TAB_KEY``, não da data: uma aposta da aba
+        seguinte datada em um mês anterior fica de fora, e uma aposta da aba
+        ``key`` datada no mês seguinte fica. Quando essas apostas formam o
+        início das linhas (o caso comum), o resultado é uma fatia, sem cópia,
+        e só o resumo dos meses cortados é refeito.
+        """
+        pieces = self.index.pieces
+        if not all(TAB_KEY in piece.columns for piece in pieces):
+            return None
+        keep = [piece[TAB_KEY].to_numpy() <= key for piece in pieces]
+        kept = sum(int(mask.sum()) for mask in keep)
+        if kept == len(self.index):
+            return self
+
+        positions = [offset + mask.nonzero()[0] for mask, offset in zip(keep, self.index.offsets)]
+        if not all(len(part) == 0 or part[-1] < kept for part in positions):
+            df = concat_frames([piece[mask] for piece, mask in zip(pieces, keep)])
+            return type(self).build(df, presorted=True)
+
+        # O acumulado dentro de cada mês e as cores não mudam ao cortar as linhas
+        # seguintes, mas os meses com linhas cortadas têm o resumo refeito
+        index = self.index.prefix(kept)
+        cut = {month for month, (start, end) in self.index.ranges.items() if start < kept < end}
+        rows = index.select(cut)
+        summary = self.summary.loc[self.summary.index.isin(index.keys) & ~self.summary.index.isin(cut)]
+        if not rows.empty:
+            summary = pd.concat([summary, monthly_summary(rows)]).sort_index()
+        return type(self)(index=index, summary=summary)
+
+    @classmethod
+    def extend(cls, base, df):
+        """``base`` com as apostas ``df`` de meses posteriores acrescentadas.
+
+        As apostas de ``df`` ficam em uma parte própria do índice: só elas são
+        ordenadas, resumidas e coloridas, e as de ``base`` não são copiadas. Se
+        ``df`` tiver apostas de meses que já estão em ``base``, o snapshot é
+        refeito do zero.
+        """
+        if base is None:
+            return cls.build(df)
+        if df.empty:
+            return base
+
+        if base.index.keys and df[MONTH_KEY].min() <= base.index.keys[-1]:
+            return cls.build(concat_frames([base.index.df, df]))
+        recent = cls.build(df)
+        return cls(index=base.index.append(recent.index), summary=pd.concat([base.summary, recent.summary]))
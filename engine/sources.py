@@ -0,0 +1,392 @@
+"""Origens dos CSVs das abas mensais.
+
+O loader pede a cada origem o CSV de uma aba (``fetch(sheet_id, sheet_name)``)
+no mesmo formato da exportação gviz do Google Sheets. A resposta traz os
+validadores HTTP (``ETag``/``Last-Modified``) quando a origem os fornece; com
+os validadores da carga anterior, a origem pode responder que a aba não mudou
+(``content`` vazio), como um 304 do HTTP. Além da planilha online,
+há origens locais para testar e medir a carga sem rede:
+
+- ``GvizSource``: o endpoint gviz do Google (ou um servidor compatível, via ``base_url``);
+- ``DirectorySource``: arquivos ``<pasta>/<id da planilha>/Maio-23.csv`` (ou ``<pasta>/Maio-23.csv``);
+- ``WorkbookSource``: as abas de um arquivo .xlsx, como ``GA Broker - Resultados.xlsx``;
+- ``FlakySource``: envolve outra origem com latência e falhas artificiais.
+
+A origem usada pelos dashboards vem da variável de ambiente ``DASHBOARD_SOURCE``
+(URL de um servidor compatível, pasta ou arquivo .xlsx); sem ela, o Google.
+``DASHBOARD_SOURCE_LATENCY`` (segundos) e ``DASHBOARD_SOURCE_FAILURES`` (fração
+das requisições) ativam a latência e as falhas artificiais.
+
+Para servir uma origem local no formato do endpoint gviz:
+
+    python -m engine.sources servir dados/ --porta 8765 --latencia 0.3 --falhas 0.1
+    DASHBOARD_SOURCE=http://localhost:8765 streamlit run dashboard.py
+"""
+import argparse
+import csv
+import hashlib
+import io
+import os
+import random
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+from openpyxl import load_workbook
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+GVIZ_BASE_URL = 'https://docs.google.com'
+
+# Conexões HTTP mantidas abertas por host (uma por download simultâneo do loader)
+POOL_SIZE = 8
+
+# Novas tentativas em falhas de conexão e respostas 429/5xx, com espera exponencial
+# (0,5 s, 1 s, 2 s...) mais até RETRY_JITTER segundos aleatórios, respeitando Retry-After
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Tempo máximo (em segundos) para abrir a conexão; o de leitura vem de cada chamada
+CONNECT_TIMEOUT = 5
+
+
+class SourceError(Exception):
+    """Falha ao obter o CSV de uma aba."""
+
+
+class SimulatedFailure(SourceError):
+    """Falha artificial de ``FlakySource``."""
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """CSV de uma aba (``content``) e seus validadores; ``content`` é None se a aba não mudou."""
+    content: bytes | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self):
+        return self.content is None
+
+
+class DataSource:
+    """Interface das origens: ``fetch`` devolve um ``FetchResult`` com o CSV da aba.
+
+    ``etag`` e ``last_modified`` são os validadores da carga anterior; a
+    origem pode ignorá-los e sempre devolver o conteúdo.
+    """
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        raise NotImplementedError
+
+
+def file_etag(path):
+    stat = path.stat()
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def make_session(pool_size=POOL_SIZE, retries=RETRIES):
+    """Sessão HTTP com conexões reaproveitadas (keep-alive) e novas tentativas."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF,
+        backoff_jitter=RETRY_JITTER,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class GvizSource(DataSource):
+    """Endpoint gviz, com uma sessão HTTP compartilhada por todas as abas e cargas."""
+
+    def __init__(self, base_url=GVIZ_BASE_URL, session=None):
+        self.base_url = base_url.rstrip('/')
+        self.session = session or make_session()
+
+    def csv_url(self, sheet_id, sheet_name):
+        # URL-encode the sheet name to handle special characters like 'ç'
+        encoded_sheet_name = urllib.parse.quote(sheet_name)
+        return f"{self.base_url}/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={encoded_sheet_name}"
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        response = self.session.get(self.csv_url(sheet_id, sheet_name), headers=headers,
+                                    timeout=(CONNECT_TIMEOUT, timeout))
+        if response.status_code == 304:
+            return FetchResult(None, etag, last_modified)
+        response.raise_for_status()
+        return FetchResult(response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+class DirectorySource(DataSource):
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, sheet_id, sheet_name):
+        file_name = f"{sheet_name.replace('/', '-')}.csv"
+        path = self.root / sheet_id / file_name
+        return path if path.exists() else self.root / file_name
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        path = self.path(sheet_id, sheet_name)
+        if not path.exists():
+            raise SourceError(f"aba {sheet_name} não encontrada em {self.root}")
+        current = file_etag(path)
+        if current == etag:
+            return FetchResult(None, etag)
+        return FetchResult(path.read_bytes(), current)
+
+
+class WorkbookSource(DataSource):
+    """Abas de um .xlsx exportadas como CSV; a aba "Maio/23" é a planilha "Maio23".
+
+    O arquivo é aberto em modo somente leitura (as planilhas são lidas sob
+    demanda, linha a linha) e o CSV de cada aba fica em memória enquanto o
+    arquivo não muda (mesmo ``mtime``). As datas saem no formato em que a
+    planilha as exibe: ``date_formats[sheet_id]`` (o ``date_format`` de cada
+    dashboard) ou, para outras planilhas, ``date_format``. Cabeçalhos antigos
+    são trocados pelos atuais (``HEADER_ALIASES``; a primeira coluna é sempre
+    ``Nº``). O ``sheet_id`` só escolhe o formato das datas, e o ``ETag`` é o
+    do arquivo, comum a todas as abas.
+    """
+
+    HEADER_ALIASES = {'Lucro/Perda': 'L/P'}
+
+    def __init__(self, path, date_format='%d/%m', date_formats=None):
+        self.path = Path(path)
+        self.date_format = date_format
+        self.date_formats = dict(date_formats or {})
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._workbook = None
+        self._csv = {}
+
+    def _open(self):
+        mtime = self.path.stat().st_mtime_ns
+        if mtime != self._mtime:
+            if self._workbook is not None:
+                self._workbook.close()
+            self._workbook = load_workbook(self.path, read_only=True, data_only=True)
+            self._mtime = mtime
+            self._csv = {}
+        return self._workbook
+
+    def sheet_title(self, workbook, sheet_name):
+        for title in (sheet_name, sheet_name.replace('/', '')):
+            if title in workbook.sheetnames:
+                return title
+        raise SourceError(f"aba {sheet_name} não encontrada em {self.path.name}")
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        current = file_etag(self.path)
+        if current == etag:
+            return FetchResult(None, etag)
+        date_format = self.date_formats.get(sheet_id, self.date_format)
+        key = (date_format, sheet_name)
+        # O modo somente leitura do openpyxl não pode ser usado por duas threads ao mesmo tempo
+        with self._lock:
+            workbook = self._open()
+            if key not in self._csv:
+                worksheet = workbook[self.sheet_title(workbook, sheet_name)]
+                self._csv[key] = self._to_csv(worksheet.iter_rows(values_only=True), date_format)
+            return FetchResult(self._csv[key], current)
+
+    def _to_csv(self, rows, date_format):
+        header = list(next(rows, ()))
+        if header:
+            header[0] = 'Nº'
+        header = [self.HEADER_ALIASES.get(name, name) for name in header]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(header)
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            writer.writerow([self._format(value, date_format) for value in row])
+        return buffer.getvalue().encode('utf-8')
+
+    def _format(self, value, date_format):
+        if isinstance(value, (datetime, date)):
+            return value.strftime(date_format)
+        return value
+
+
+class FlakySource(DataSource):
+    """Outra origem com latência (``latency`` ± ``jitter`` segundos) e uma fração de falhas.
+
+    Com ``seed`` a sequência de atrasos e falhas é reproduzível.
+    """
+
+    def __init__(self, source, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.source = source
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.failure_rate
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"tempo esgotado ao buscar a aba {sheet_name}")
+        time.sleep(delay)
+        if fail:
+            raise SimulatedFailure(f"falha simulada ao buscar a aba {sheet_name}")
+        return self.source.fetch(sheet_id, sheet_name, timeout, etag, last_modified)
+
+
+def source_from_location(location):
+    """Origem correspondente a uma URL, pasta ou arquivo .xlsx."""
+    if location.startswith(('http://', 'https://')):
+        return GvizSource(location)
+    if location.endswith('.xlsx'):
+        # Cada dashboard lê as datas no formato da sua planilha
+        from engine.cache import sheet_id_from_url
+        from engine.config import DASHBOARDS
+        date_formats = {sheet_id_from_url(config.sheet_url): config.date_format for config in DASHBOARDS.values()}
+        return WorkbookSource(location, date_formats=date_formats)
+    return DirectorySource(location)
+
+
+def source_from_env(environ=os.environ):
+    location = environ.get('DASHBOARD_SOURCE')
+    source = source_from_location(location) if location else GvizSource()
+
+    latency = float(environ.get('DASHBOARD_SOURCE_LATENCY', 0))
+    failure_rate = float(environ.get('DASHBOARD_SOURCE_FAILURES', 0))
+    if latency or failure_rate:
+        source = FlakySource(source, latency=latency, jitter=latency / 2, failure_rate=failure_rate)
+    return source
+
+
+_source = None
+
+
+def get_source():
+    """Origem usada pelo loader (definida na primeira chamada a partir do ambiente)."""
+    global _source
+    if _source is None:
+        _source = source_from_env()
+    return _source
+
+
+def set_source(source):
+    """Troca a origem usada pelo loader (por exemplo, em benchmarks)."""
+    global _source
+    _source = source
+
+
+class GvizRequestHandler(BaseHTTPRequestHandler):
+    """Responde a ``/spreadsheets/d/<id>/gviz/tq?sheet=<aba>`` com o CSV da origem do servidor.
+
+    Envia ``ETag`` (o da origem ou um hash do conteúdo) e responde 304 a
+    ``If-None-Match`` com o mesmo valor.
+    """
+
+    # HTTP/1.1 mantém a conexão aberta entre requisições, como o Google
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        sheet_name = urllib.parse.parse_qs(url.query).get('sheet', [None])[0]
+        if len(parts) != 5 or parts[:2] != ['spreadsheets', 'd'] or parts[3:] != ['gviz', 'tq'] or not sheet_name:
+            self.send_error(404)
+            return
+
+        try:
+            result = self.server.source.fetch(parts[2], sheet_name, etag=self.headers.get('If-None-Match'))
+        except SimulatedFailure as e:
+            self.send_error(503, str(e))
+            return
+        except SourceError as e:
+            self.send_error(404, str(e))
+            return
+        except TimeoutError as e:
+            self.send_error(504, str(e))
+            return
+
+        if result.not_modified:
+            self.send_response(304)
+            self.send_header('ETag', result.etag)
+            self.end_headers()
+            return
+
+        etag = result.etag or f'"{hashlib.blake2b(result.content, digest_size=16).hexdigest()}"'
+        if etag == self.headers.get('If-None-Match'):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv; charset=utf-8')
+        self.send_header('Content-Length', str(len(result.content)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(result.content)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(source, host='127.0.0.1', port=8765, quiet=False):
+    """Servidor HTTP compatível com o endpoint gviz, servindo ``source``."""
+    server = ThreadingHTTPServer((host, port), GvizRequestHandler)
+    server.daemon_threads = True
+    server.source = source
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local compatível com o endpoint gviz do Google Sheets.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    servir = sub.add_parser('servir', help="Servir as abas de uma pasta de CSVs ou de um arquivo .xlsx")
+    servir.add_argument('origem', help="Pasta com os CSVs ou arquivo .xlsx")
+    servir.add_argument('--host', default='127.0.0.1')
+    servir.add_argument('--porta', type=int, default=8765)
+    servir.add_argument('--latencia', type=float, default=0.0, help="Atraso médio de cada resposta, em segundos")
+    servir.add_argument('--variacao', type=float, default=0.0, help="Variação máxima do atraso, em segundos")
+    servir.add_argument('--falhas', type=float, default=0.0, help="Fração das requisições que falham (0 a 1)")
+    servir.add_argument('--semente', type=int, default=None, help="Semente para atrasos e falhas reproduzíveis")
+    servir.add_argument('--silencioso', action='store_true', help="Não registrar cada requisição")
+    args = parser.parse_args(argv)
+
+    source = FlakySource(source_from_location(args.origem), latency=args.latencia, jitter=args.variacao,
+                         failure_rate=args.falhas, seed=args.semente)
+    server = make_server(source, args.host, args.porta, quiet=args.silencioso)
+    print(f"Servindo {args.origem} em http://{args.host}:{args.porta}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Histórico limpo de cada dashboard em um dataset Parquet particionado por mês.
+
+O histórico dos meses encerrados (apostas já concatenadas, limpas e com os
+tipos de ``engine.schema``) é gravado em ``.cache/historico/<dashboard>/``,
+uma pasta por chave de mês (``Mês=24280/``, ano * 12 + mês - 1), junto com o
+manifesto ``_abas.json`` das abas que o compõem. Na inicialização o histórico
+é lido daqui, sem baixar nem converter CSVs, enquanto o manifesto coincidir
+com as abas encerradas.
+
+Outras ferramentas podem ler o mesmo dataset, filtrando os meses direto na
+leitura (só as pastas pedidas são abertas):
+
+    pd.read_parquet('.cache/historico/broker', filters=[('Mês', '>=', 2024 * 12)])
+"""
+import json
+import logging
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from engine.cache import CACHE_DIR
+from engine.files import replace_dir
+from engine.schema import MONTH_KEY
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = CACHE_DIR.parent / 'historico'
+# Arquivos iniciados por "_" são ignorados pelos leitores de datasets Parquet
+MANIFEST = '_abas.json'
+# Versão do formato do histórico; históricos gravados com outra versão são montados de novo
+VERSION = 2
+
+PARTITIONING = ds.partitioning(pa.schema([(MONTH_KEY, pa.int32())]), flavor='hive')
+
+
+def store_path(dashboard_key):
+    return STORE_DIR / dashboard_key
+
+
+def read_manifest(dashboard_key):
+    try:
+        return json.loads((store_path(dashboard_key) / MANIFEST).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def read(dashboard_key, sheet_names=None, months=None):
+    """Histórico gravado do dashboard, ou None.
+
+    Com ``sheet_names``, só devolve o histórico se ele tiver sido gravado com
+    exatamente essas abas. ``months`` restringe a leitura a essas chaves de mês.
+    """
+    manifest = read_manifest(dashboard_key)
+    if manifest is None or manifest.get('versao') != VERSION:
+        return None
+    if sheet_names is not None and manifest['abas'] != list(sheet_names):
+        return None
+    try:
+        dataset = ds.dataset(store_path(dashboard_key), format='parquet', partitioning=PARTITIONING)
+        predicate = ds.field(MONTH_KEY).isin(list(months)) if months is not None else None
+        df = dataset.to_table(filter=predicate).to_pandas()
+    except Exception:
+        # Dataset corrompido ou de versão incompatível: descartar e montar de novo
+        invalidate(dashboard_key)
+        return None
+    return df[manifest['colunas']]
+
+
+def write(dashboard_key, df, sheet_names):
+    """Grava o histórico, substituindo o anterior. Falhas só são registradas, como no cache das abas."""
+    def write_dataset(tmp_path):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(table, tmp_path, format='parquet', partitioning=PARTITIONING,
+                         existing_data_behavior='overwrite_or_ignore')
+        manifest = {'versao': VERSION, 'abas': list(sheet_names), 'colunas': list(df.columns)}
+        with open(os.path.join(tmp_path, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    try:
+        replace_dir(store_path(dashboard_key), write_dataset)
+    except Exception:
+        logger.warning("Falha ao gravar o histórico de %s", dashboard_key, exc_info=True)
+
+
+def invalidate(dashboard_key=None):
+    """Remove o histórico gravado de um dashboard (ou de todos)."""
+    shutil.rmtree(STORE_DIR if dashboard_key is None else store_path(dashboard_key), ignore_errors=True)
@@ -0,0 +1,69 @@
+"""Cores da tabela de apostas, calculadas uma vez por snapshot.
+
+A cor de cada aposta depende só do Resultado (repetida na coluna L/P) e do
+sinal do Saldo. As duas colunas de cores são ``category`` sobre a mesma
+paleta e saem de consultas vetorizadas: os códigos das categorias de
+Resultado viram códigos de cor com um ``take``, e o sinal do Saldo com
+``np.select``. O snapshot guarda as cores alinhadas às apostas; a tabela só
+seleciona as linhas exibidas.
+"""
+import numpy as np
+import pandas as pd
+
+RESULT_COLORS = {
+    "Ganha": "#27AE60",  # Strong green
+    "Ganha/devolvida": "#2ECC71",  # Light green
+    "Devolvida": "#BFBFBF",  # Neutral gray
+    "Aguardando": "#BFBFBF",  # Neutral gray
+    "Perdida/devolvida": "#E74C3C",  # Light red
+    "Perdida": "#C0392B",  # Strong red
+}
+POSITIVE_COLOR = "#27AE60"
+NEGATIVE_COLOR = "#C0392B"
+ZERO_COLOR = "#BFBFBF"
+# Resultado desconhecido ou Saldo vazio
+DEFAULT_COLOR = "black"
+
+COLOR_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(
+    [*RESULT_COLORS.values(), POSITIVE_COLOR, NEGATIVE_COLOR, ZERO_COLOR, DEFAULT_COLOR])))
+
+
+def color_code(color):
+    return COLOR_DTYPE.categories.get_loc(color)
+
+
+def result_colors(resultado):
+    """Cor de cada valor de Resultado, como ``category`` de ``COLOR_DTYPE``."""
+    resultado = resultado.astype('category')
+    # Um código de cor por categoria de Resultado, e o último para valores vazios (código -1)
+    lookup = np.array([color_code(RESULT_COLORS.get(value, DEFAULT_COLOR)) for value in resultado.cat.categories]
+                      + [color_code(DEFAULT_COLOR)], dtype=np.int8)
+    codes = lookup[resultado.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=COLOR_DTYPE), index=resultado.index)
+
+
+def sign_colors(values):
+    """Cor de cada saldo: verde se positivo, vermelho se negativo, cinza se zero."""
+    values = np.asarray(values, dtype=float)
+    codes = np.select([values > 0, values < 0, values == 0],
+                      [color_code(POSITIVE_COLOR), color_code(NEGATIVE_COLOR), color_code(ZERO_COLOR)],
+                      color_code(DEFAULT_COLOR)).astype(np.int8)
+    return pd.Categorical.from_codes(codes, dtype=COLOR_DTYPE)
+
+
+def style_map(df):
+    """Cores das colunas Resultado e Saldo de cada aposta, com o índice de ``df``.
+
+    None se ``df`` não tiver as duas colunas.
+    """
+    if 'Resultado' not in df.columns or 'Saldo' not in df.columns:
+        return None
+    return pd.DataFrame({
+        'Resultado': result_colors(df['Resultado']),
+        'Saldo': pd.Series(sign_colors(df['Saldo']), index=df.index),
+    })
+
+
+def css(colors):
+    """Estilo CSS de cada cor, formatado uma vez por categoria."""
+    return colors.cat.rename_categories(lambda color: f"color: {color}").astype(object)
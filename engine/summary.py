@@ -0,0 +1,82 @@
+"""Resumo mensal das apostas, usado para calcular as métricas do período.
+
+O resumo tem uma linha por mês com as somas e contagens necessárias para os
+cartões de Saldo, ROI, Taxa de Acerto e Odd Média. As métricas de qualquer
+combinação de meses saem somando algumas linhas, sem varrer as apostas.
+"""
+import numpy as np
+import pandas as pd
+
+from engine.config import PROFIT, STAKE
+from engine.schema import MONTH_KEY, ROW_KEY, TAB_KEY
+
+# Peso de cada resultado na taxa de acerto: (vitórias, derrotas)
+RESULT_WEIGHTS = {
+    'Ganha': (1.0, 0.0),
+    'Perdida': (0.0, 1.0),
+    'Ganha/devolvida': (0.5, 0.0),
+    'Perdida/devolvida': (0.0, 0.5),
+}
+
+
+def monthly_summary(df):
+    """Uma linha por chave de mês com somas, contagens e o último saldo do mês."""
+    grouped = df.groupby(MONTH_KEY, sort=True)
+    summary = pd.DataFrame(index=pd.Index(sorted(df[MONTH_KEY].unique()), name=MONTH_KEY))
+
+    if PROFIT in df.columns:
+        summary['lucro'] = grouped[PROFIT].sum()
+        summary['lucro_qtd'] = grouped[PROFIT].count()
+    if STAKE in df.columns:
+        summary['stake'] = grouped[STAKE].sum()
+    if 'Saldo' in df.columns:
+        # O saldo da planilha é acumulado na ordem das linhas, não das datas: o
+        # saldo final do mês é o da última linha preenchida na ordem da planilha
+        balances = df[[MONTH_KEY, 'Saldo']]
+        if TAB_KEY in df.columns and ROW_KEY in df.columns:
+            balances = balances.take(np.lexsort((df[ROW_KEY].to_numpy(), df[TAB_KEY].to_numpy())))
+        # last() ignora valores nulos: é o último saldo preenchido do mês
+        summary['saldo_final'] = balances.groupby(MONTH_KEY, sort=True)['Saldo'].last()
+    if 'Odd' in df.columns:
+        summary['odd_soma'] = grouped['Odd'].sum()
+        summary['odd_qtd'] = grouped['Odd'].count()
+    if 'Resultado' in df.columns:
+        counts = df.groupby(MONTH_KEY, sort=True, observed=True)['Resultado'].value_counts().unstack(fill_value=0)
+        summary = summary.join(counts.reindex(columns=list(RESULT_WEIGHTS), fill_value=0))
+
+    return summary.fillna({'lucro_qtd': 0, 'odd_qtd': 0})
+
+
+def period_metrics(summary, keys, cumulative):
+    """Saldo, ROI, taxa de acerto e odd média dos meses ``keys``.
+
+    Com ``cumulative`` o saldo é a soma do L/P dos meses (o saldo recalculado
+    pela seleção); sem ele, é o último saldo registrado na planilha. Métricas
+    sem dados suficientes ficam como ``None``.
+    """
+    rows = summary.loc[summary.index.isin(keys)]
+    metrics = {'saldo': None, 'roi': None, 'taxa_acerto': None, 'odd_media': None}
+
+    if cumulative and 'lucro' in rows.columns:
+        if rows['lucro_qtd'].sum() > 0:
+            metrics['saldo'] = rows['lucro'].sum()
+    elif 'saldo_final' in rows.columns:
+        balances = rows['saldo_final'].dropna()
+        if not balances.empty:
+            metrics['saldo'] = balances.iloc[-1]
+
+    if metrics['saldo'] is not None and 'stake' in rows.columns:
+        total_stakes = rows['stake'].sum()
+        if total_stakes > 0:
+            metrics['roi'] = metrics['saldo'] / total_stakes * 100
+
+    if set(RESULT_WEIGHTS).issubset(rows.columns):
+        totals = rows[list(RESULT_WEIGHTS)].sum()
+        wins = sum(totals[result] * weights[0] for result, weights in RESULT_WEIGHTS.items())
+        losses = sum(totals[result] * weights[1] for result, weights in RESULT_WEIGHTS.items())
+        metrics['taxa_acerto'] = wins / (wins + losses) * 100 if wins + losses > 0 else 0
+
+    if 'odd_qtd' in rows.columns and rows['odd_qtd'].sum() > 0:
+        metrics['odd_media'] = rows['odd_soma'].sum() / rows['odd_qtd'].sum()
+
+    return metrics
@@ -0,0 +1,71 @@
+"""Consulta paginada da tabela de apostas: busca, ordenação e página.
+
+A busca e a ordenação rodam sobre as apostas do snapshot e resultam só em
+posições de linhas; apenas as linhas da página pedida são copiadas,
+formatadas e enviadas ao navegador.
+"""
+import numpy as np
+
+from engine.config import PROFIT
+from engine.schema import MONTH_KEY
+
+PAGE_SIZES = (25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 50
+
+SEARCH_COLUMNS = ('Entrada', 'Mercado')
+
+# Colunas de ordenação -> chaves do sort, da mais à menos significativa. O Nº
+# recomeça a cada aba, então vem sempre depois do mês
+SORT_KEYS = {
+    'Data': ('Data', MONTH_KEY, 'Nº'),
+    'Nº': (MONTH_KEY, 'Nº'),
+    PROFIT: (PROFIT,),
+}
+
+
+def contains(series, text):
+    """Máscara das linhas de ``series`` que contêm ``text``, sem diferenciar maiúsculas."""
+    if hasattr(series, 'cat'):
+        # Colunas category: procurar nas categorias e comparar os códigos
+        matches = series.cat.categories[series.cat.categories.str.contains(text, case=False, regex=False)]
+        return series.isin(matches).to_numpy()
+    return series.str.contains(text, case=False, regex=False, na=False).to_numpy()
+
+
+def search(df, text):
+    """Posições das apostas com ``text`` em alguma das colunas de busca."""
+    text = text.strip()
+    if not text:
+        return np.arange(len(df))
+    mask = np.zeros(len(df), dtype=bool)
+    for column in SEARCH_COLUMNS:
+        if column in df.columns:
+            mask |= contains(df[column], text)
+    return np.flatnonzero(mask)
+
+
+def sort_key(series):
+    """Valores de ``series`` para ``np.lexsort``, com os vazios antes de todos."""
+    if series.dtype.kind == 'M':
+        return series.to_numpy().view('int64')
+    return series.to_numpy('float64', na_value=-np.inf)
+
+
+def sort(df, positions, by, descending=True):
+    """``positions`` reordenadas pela coluna ``by`` (uma das chaves de ``SORT_KEYS``)."""
+    # Só as colunas de ordenação são lidas; lexsort usa a última chave como a principal
+    keys = [sort_key(df[column])[positions] for column in reversed(SORT_KEYS[by]) if column in df.columns]
+    order = np.lexsort(keys) if keys else np.arange(len(positions))
+    if descending:
+        order = order[::-1]
+    return positions[order]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def page(df, positions, number, page_size):
+    """Apostas da página ``number`` (a partir de 1) de ``positions``."""
+    start = (number - 1) * page_size
+    return df.take(positions[start:start + page_size])
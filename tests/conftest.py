@@ -0,0 +1,16 @@
+import pytest
+
+from engine import cache, export, incremental, shared, sources, store
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """Caches em disco em uma pasta temporária, sem as abas memorizadas de outros testes."""
+    monkeypatch.setattr(cache, 'CACHE_DIR', tmp_path / 'abas')
+    monkeypatch.setattr(store, 'STORE_DIR', tmp_path / 'historico')
+    monkeypatch.setattr(shared, 'SNAPSHOT_DIR', tmp_path / 'snapshots')
+    monkeypatch.setattr(export, 'EXPORT_DIR', tmp_path / 'exportacoes')
+    incremental.forget()
+    yield tmp_path
+    incremental.forget()
+    sources.set_source(None)
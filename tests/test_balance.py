@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.balance import cumulative_balance, month_cumsum
+from engine.schema import apply_schema
+from engine.snapshot import Snapshot
+
+
+def month(year, number):
+    return year * 12 + number - 1
+
+
+@pytest.fixture(scope='module')
+def snapshot():
+    rng = np.random.default_rng(1)
+    dates = pd.to_datetime(rng.integers(pd.Timestamp('2024-11-01').value // 10**9,
+                                        pd.Timestamp('2025-04-30').value // 10**9, 400), unit='s').normalize()
+    profit = rng.normal(size=400).round(3)
+    profit[::37] = np.nan  # apostas sem L/P
+    df = pd.DataFrame({'Data': dates, 'L/P': profit, 'Resultado': 'Ganha'})
+    df['Saldo'] = df['L/P'].cumsum()
+    return Snapshot.build(apply_schema(df))
+
+
+def test_month_cumsum_de_um_mes():
+    df = apply_schema(pd.DataFrame({'Data': pd.to_datetime(['2025-01-01'] * 3), 'L/P': [1.0, np.nan, 2.0]}))
+    np.testing.assert_array_equal(month_cumsum(df), [1.0, np.nan, 3.0])
+
+
+@pytest.mark.parametrize('keys', [
+    [month(2025, 1)],
+    [month(2025, 1), month(2025, 2)],
+    [month(2024, 11), month(2025, 2), month(2025, 4)],  # meses não contíguos
+    [month(2025, number) for number in range(1, 13)],  # "Acumulado 2025": começa do zero em janeiro
+])
+def test_igual_ao_cumsum_das_apostas_selecionadas(snapshot, keys):
+    df = snapshot.index.select(keys)
+    expected = df['L/P'].cumsum().to_numpy()
+    np.testing.assert_allclose(cumulative_balance(df, snapshot.summary), expected, rtol=0, atol=1e-12)
+
+
+def test_selecao_vazia(snapshot):
+    assert len(cumulative_balance(snapshot.index.select([month(2030, 1)]), snapshot.summary)) == 0
+
+
+def test_selecao_entre_historico_e_abas_em_aberto(snapshot):
+    history = snapshot.index.select([month(2024, 11), month(2024, 12), month(2025, 1)])
+    recent = snapshot.index.select([month(2025, 2), month(2025, 3)])
+    extended = Snapshot.extend(Snapshot.build(history), recent)
+    df = extended.index.select([month(2024, 12), month(2025, 3)])
+    np.testing.assert_allclose(cumulative_balance(df, extended.summary), df['L/P'].cumsum().to_numpy(),
+                               rtol=0, atol=1e-12)
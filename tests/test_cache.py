@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from datetime import date, datetime, time
+
+import pandas as pd
+
+from engine import cache, loader, shared, sources, store
+from engine.config import BROKER
+
+SHEET_ID = cache.sheet_id_from_url(BROKER.sheet_url)
+CSV = ("Nº,Entrada,País,Mercado,Stake,Data,Odd,Resultado,L/P,Saldo\n"
+       "1,Jogo 1,Brasil,Over,1,01/05,\"1,9\",Ganha,\"0,9\",\"0,9\"\n"
+       "2,Jogo 2,Brasil,Over,1,31/05,\"2,0\",Perdida,-1,\"-0,1\"\n")
+
+
+class CountingSource(sources.DataSource):
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        self.calls += 1
+        return sources.FetchResult(CSV.encode('utf-8'))
+
+
+def test_is_closed_depois_da_carencia():
+    assert cache.closed_since('Maio/23') == date(2023, 6, 1 + cache.GRACE_DAYS)
+    assert not cache.is_closed('Maio/23', today=date(2023, 6, cache.GRACE_DAYS))
+    assert cache.is_closed('Maio/23', today=date(2023, 6, 1 + cache.GRACE_DAYS))
+    assert not cache.is_closed('Aba qualquer')
+
+
+def test_copia_gravada_antes_do_encerramento_e_baixada_de_novo(isolated):
+    source = CountingSource()
+    sources.set_source(source)
+
+    # Cópia parcial, gravada no meio do mês
+    partial = pd.DataFrame({'Nº': [1], 'Data': [pd.Timestamp('2023-05-01')]})
+    cache.write(SHEET_ID, 'Maio/23', partial)
+    mid_month = datetime.combine(date(2023, 5, 15), time()).timestamp()
+    os.utime(cache.cache_path(SHEET_ID, 'Maio/23'), (mid_month, mid_month))
+    assert cache.read_closed(SHEET_ID, 'Maio/23') is None
+
+    df, mensagens, status = loader.load_tab(BROKER, 'Maio/23')
+    assert (status, len(df), source.calls) == ('baixada', 2, 1)
+
+    # Regravada agora, depois do encerramento: passa a ser lida do disco
+    df, mensagens, status = loader.load_tab(BROKER, 'Maio/23')
+    assert (status, len(df), source.calls) == ('disco', 2, 1)
+
+
+def test_limpar_apaga_historico_e_snapshots_publicados(isolated):
+    cache.write(SHEET_ID, 'Maio/23', pd.DataFrame({'Nº': [1]}))
+    for path in (shared.snapshot_path('broker'), store.store_path('broker') / store.MANIFEST):
+        path.parent.mkdir(parents=True)
+        path.write_text('antigo')
+
+    assert cache.invalidate() == 1
+    assert shared.published_at('broker') is None
+    assert not store.store_path('broker').exists()
+
+
+def test_linha_de_comando_sem_streamlit():
+    result = subprocess.run(
+        [sys.executable, '-W', 'error::RuntimeWarning', '-c',
+         "import runpy, sys; sys.argv = ['cache', 'listar']; runpy.run_module('engine.cache', run_name='__main__'); "
+         "assert 'streamlit' not in sys.modules and 'plotly' not in sys.modules"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,29 @@
+import numpy as np
+
+from engine.downsample import lttb
+
+
+def test_mantem_todos_os_pontos_abaixo_do_limite():
+    assert lttb(np.arange(5), np.arange(5), 5).tolist() == [0, 1, 2, 3, 4]
+    assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+    assert lttb(np.arange(5), np.arange(5), 2).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_pontos_escolhidos():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=5000).cumsum()
+    x = np.arange(len(y))
+
+    selected = lttb(x, y, 300)
+
+    assert len(selected) == 300
+    assert selected[0] == 0 and selected[-1] == len(y) - 1
+    assert np.all(np.diff(selected) > 0)
+    assert np.argmax(y) in selected
+    assert np.argmin(y) in selected
+
+
+def test_pico_isolado_e_mantido():
+    y = np.zeros(1000)
+    y[537] = 100.0
+    assert 537 in lttb(np.arange(1000), y, 50)
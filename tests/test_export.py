@@ -0,0 +1,50 @@
+import os
+import time
+
+import pandas as pd
+
+from engine import export
+
+
+def make_frame():
+    return pd.DataFrame({'Nº': [1, 2], 'L/P': [1.5, -1.0]})
+
+
+def age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_prune_mantem_arquivos_usados_recentemente(isolated):
+    export.EXPORT_DIR.mkdir()
+    paths = [export.EXPORT_DIR / f'{i}.csv' for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_text('x')
+        age(path, 1000 + i)
+    age(paths[2], 10)
+    age(paths[3], 5)
+    (export.EXPORT_DIR / 'gravando.tmp').write_text('x')
+    age(export.EXPORT_DIR / 'gravando.tmp', 5000)
+
+    export.prune(max_files=1)
+
+    assert sorted(p.name for p in export.EXPORT_DIR.iterdir()) == ['2.csv', '3.csv', 'gravando.tmp']
+
+
+def test_arquivo_apagado_e_gerado_de_novo(isolated):
+    calls = []
+
+    def counted():
+        calls.append(1)
+        return make_frame()
+
+    first = export.export('chave', 'CSV', counted)
+    path = export.export_path('chave', 'CSV')
+    age(path, 1000)
+    assert export.export('chave', 'CSV', counted) == first
+    assert len(calls) == 1
+    assert path.stat().st_mtime > time.time() - 60
+
+    path.unlink()
+    assert export.export('chave', 'CSV', counted) == first
+    assert len(calls) == 2
@@ -0,0 +1,55 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from engine import cache, files, shared
+
+
+def fail(tmp_path):
+    with open(tmp_path, 'w') as f:
+        f.write('pela metade')
+    raise OSError('disco cheio')
+
+
+def test_falha_mantem_o_arquivo_anterior(tmp_path):
+    path = tmp_path / 'dados' / 'aba.txt'
+    files.replace_file(path, lambda tmp: open(tmp, 'w').write('completo'))
+    with pytest.raises(OSError):
+        files.replace_file(path, fail)
+    assert path.read_text() == 'completo'
+    assert [p.name for p in path.parent.iterdir()] == ['aba.txt']
+
+
+def test_pasta_substituida_por_inteiro(tmp_path):
+    path = tmp_path / 'historico'
+
+    def write(names):
+        def write_files(tmp):
+            for name in names:
+                open(f'{tmp}/{name}', 'w').close()
+        return write_files
+
+    files.replace_dir(path, write(['a', 'b']))
+    files.replace_dir(path, write(['c']))
+    with pytest.raises(OSError):
+        files.replace_dir(path, lambda tmp: fail(f'{tmp}/d'))
+
+    assert [p.name for p in path.iterdir()] == ['c']
+    assert [p.name for p in tmp_path.iterdir()] == ['historico']
+
+
+def test_falhas_de_gravacao_sao_registradas(isolated, caplog, monkeypatch):
+    def replace_file(path, write):
+        fail(isolated / 'x')
+
+    monkeypatch.setattr(cache, 'replace_file', replace_file)
+    monkeypatch.setattr(shared, 'replace_file', replace_file)
+    snapshot = type('Snapshot', (), {'index': type('Index', (), {'df': pd.DataFrame({'a': [1]})})})
+
+    with caplog.at_level(logging.WARNING):
+        cache.write('planilha', 'Maio/23', pd.DataFrame({'a': [1]}))
+        assert shared.publish('broker', snapshot, ()) is False
+
+    assert [record.name for record in caplog.records] == ['engine.cache', 'engine.shared']
+    assert all(record.exc_info for record in caplog.records)
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from engine import incremental
+
+KEY = ('planilha', 'Outubro/26')
+
+
+@pytest.fixture(autouse=True)
+def forget():
+    incremental.forget()
+    yield
+    incremental.forget()
+
+
+class Parser:
+    """Converte a coluna ``L/P`` e conta as linhas convertidas."""
+
+    def __init__(self, mensagens=()):
+        self.rows = 0
+        self.mensagens = list(mensagens)
+
+    def __call__(self, raw):
+        self.rows += len(raw)
+        df = raw.copy()
+        df['L/P'] = df['L/P'].astype(float)
+        return df, list(self.mensagens)
+
+
+def raw(*rows):
+    return pd.DataFrame(rows, columns=['Nº', 'Resultado', 'L/P'])
+
+
+FIRST = raw((1, 'Ganha', '1'), (2, 'Perdida', '-1'), (3, 'Aguardando', '0'), (4, None, '0'))
+
+
+def test_so_converte_a_partir_da_primeira_aposta_em_aberto():
+    incremental.merge_tab(KEY, FIRST, Parser())
+
+    updated = raw((1, 'Ganha', '1'), (2, 'Perdida', '-1'), (3, 'Ganha', '2'), (4, 'Perdida', '-1'),
+                  (5, 'Aguardando', '0'))
+    parser = Parser()
+    df, mensagens, parsed = incremental.merge_tab(KEY, updated, parser)
+
+    assert (parsed, parser.rows, mensagens) == (3, 3, [])
+    full, _ = Parser()(updated)
+    pd.testing.assert_frame_equal(df, full)
+
+
+def test_prefixo_alterado_converte_a_aba_inteira():
+    incremental.merge_tab(KEY, FIRST, Parser())
+
+    corrected = raw((1, 'Perdida', '-1'), (2, 'Perdida', '-1'), (3, 'Aguardando', '0'), (4, None, '0'))
+    parser = Parser()
+    df, _, parsed = incremental.merge_tab(KEY, corrected, parser)
+
+    assert parsed == parser.rows == 4
+    assert df['L/P'].tolist() == [-1.0, -1.0, 0.0, 0.0]
+
+
+def test_linhas_removidas_convertem_a_aba_inteira():
+    incremental.merge_tab(KEY, FIRST, Parser())
+    parser = Parser()
+    incremental.merge_tab(KEY, FIRST.iloc[:1], parser)
+    assert parser.rows == 1
+
+
+def test_aba_com_mensagens_nao_e_memorizada():
+    incremental.merge_tab(KEY, FIRST, Parser(mensagens=[('warning', 'aviso')]))
+    parser = Parser()
+    incremental.merge_tab(KEY, FIRST, parser)
+    assert parser.rows == 4
+
+
+def test_stable_rows_sem_resultado():
+    assert incremental.stable_rows(pd.DataFrame({'L/P': [1.0]}), 1) == 0
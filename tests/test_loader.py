@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from engine import loader
+from engine.config import BROKER, MONEYLINE
+
+
+def tab(rows):
+    return pd.DataFrame(rows, columns=['Nº', 'Entrada', 'País', 'Mercado', 'Stake', 'Data', 'Odd', 'Resultado',
+                                       'L/P', 'Saldo'])
+
+
+def test_clean_data_mantem_colunas_vazias():
+    df = tab([(1, 'Jogo', np.nan, np.nan, 1.0, pd.Timestamp('2026-10-01'), 2.0, 'Ganha', 1.0, 1.0)])
+    cleaned = loader.clean_data(df, BROKER)
+    assert list(cleaned.columns)[:10] == list(df.columns)
+    assert cleaned['Mercado'].isna().all()
+
+
+def test_load_recent_ignora_abas_sem_apostas(monkeypatch):
+    # Aba de um mês novo só com linhas em branco: nenhuma linha tem data
+    monkeypatch.setattr(loader, 'load_tab', lambda config, name, timeout: (tab([]), [], 'baixada'))
+    history = object()
+    assert loader.load_recent(BROKER, ['Outubro/26'], history) == (history, [])
+
+
+def test_datas_em_outro_formato_geram_aviso():
+    raw = pd.DataFrame({'Nº': ['1', '2'], 'Data': ['01/10/26', '02/10/26'], 'L/P': ['1,5', '-1']})
+    df, mensagens = loader.parse_tab(raw.copy(), BROKER, 'Outubro/26')
+    assert df.empty
+    assert len(mensagens) == 1 and '%d/%m' in mensagens[0][1]
+
+    df, mensagens = loader.parse_tab(raw.copy(), MONEYLINE, 'Outubro/26')
+    assert len(df) == 2 and mensagens == []
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.parsing import parse_sheet_dates, to_numeric_br
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1,85', 1.85),
+    ('1.234,56', 1234.56),
+    ('R$ 1.234,56', 1234.56),
+    ('-0,5', -0.5),
+    ('1.85', 1.85),
+    ('10', 10.0),
+])
+def test_formatos_aceitos(text, expected):
+    result = to_numeric_br(pd.Series([text]))
+    assert result.dtype == 'float64'
+    assert result.iloc[0] == pytest.approx(expected)
+
+
+def test_coluna_com_formatos_misturados():
+    result = to_numeric_br(pd.Series(['1,85', '2.5', 'R$ 1.000,00', None]))
+    np.testing.assert_allclose(result.to_numpy(), [1.85, 2.5, 1000.0, np.nan])
+
+
+def test_valores_invalidos_viram_nan():
+    result = to_numeric_br(pd.Series(['1,85', 'abc', '', '1.234.567']))
+    assert result.dtype == 'float64'
+    np.testing.assert_allclose(result.to_numpy(), [1.85, np.nan, np.nan, 1234567.0])
+
+
+def test_coluna_numerica_vira_float64():
+    result = to_numeric_br(pd.Series([1, 2, 3]))
+    assert result.dtype == 'float64'
+    assert result.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_29_de_fevereiro_em_ano_bissexto():
+    dates = parse_sheet_dates(pd.Series(['28/02', '29/02']), '%d/%m', 2024)
+    assert dates.tolist() == [pd.Timestamp('2024-02-28'), pd.Timestamp('2024-02-29')]
+    assert parse_sheet_dates(pd.Series(['29/02/24']), '%d/%m/%y', 2024).iloc[0] == pd.Timestamp('2024-02-29')
+
+
+def test_29_de_fevereiro_em_ano_comum_vira_nat():
+    assert parse_sheet_dates(pd.Series(['29/02']), '%d/%m', 2023).isna().all()
+
+
+@pytest.mark.parametrize('date_format, text', [('%d/%m', '05/03'), ('%d/%m/%y', '05/03/22')])
+def test_ano_vem_da_aba(date_format, text):
+    # Com ano na célula, vale o ano da aba (uma data digitada com o ano errado)
+    assert parse_sheet_dates(pd.Series([text]), date_format, 2023).iloc[0] == pd.Timestamp('2023-03-05')
+
+
+@pytest.mark.parametrize('date_format', ['%d/%m', '%d/%m/%y'])
+def test_datas_invalidas_viram_nat(date_format):
+    dates = parse_sheet_dates(pd.Series(['', None, 'abc', '32/01', ' 05/03/23 ' if '%y' in date_format else ' 05/03 ']),
+                              date_format, 2023)
+    assert dates.dtype.kind == 'M'
+    assert dates.isna().tolist() == [True, True, True, True, False]
@@ -0,0 +1,97 @@
+import time
+from datetime import date
+
+from engine import cache, loader, sources
+from engine.config import DashboardConfig
+from engine.months import month_label, month_map
+from engine.refresher import RETRY_AFTER, Entry, Refresher
+
+TODAY = date.today()
+CONFIG = DashboardConfig(
+    key='teste',
+    title='Teste',
+    sheet_url='https://docs.google.com/spreadsheets/d/teste/edit',
+    start_month=TODAY.month,
+    start_year=TODAY.year,
+    columns=('Nº', 'Entrada', 'País', 'Mercado', 'Stake', 'Data', 'Odd', 'Resultado', 'L/P', 'Saldo'),
+    date_format='%d/%m',
+)
+
+CSV = ("Nº,Entrada,País,Mercado,Stake,Data,Odd,Resultado,L/P,Saldo\n"
+       "1,Jogo 1,Brasil,Over,1,01/{month:02d},\"1,9\",Ganha,\"0,9\",\"0,9\"\n").format(month=TODAY.month)
+
+
+class Switch(sources.DataSource):
+    """Origem que falha enquanto ``down`` for verdadeiro."""
+
+    def __init__(self):
+        self.down = True
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        if self.down:
+            raise sources.SourceError("fora do ar")
+        assert sheet_name == month_label(TODAY.year, TODAY.month)
+        return sources.FetchResult(CSV.encode('utf-8'))
+
+
+def test_get_tenta_de_novo_depois_de_uma_carga_sem_dados(isolated):
+    source = Switch()
+    sources.set_source(source)
+    refresher = Refresher({CONFIG.key: CONFIG}, retry_after=0)
+
+    entry = refresher.get(CONFIG)
+    assert entry.snapshot is None and entry.incomplete
+
+    source.down = False
+    entry = refresher.get(CONFIG)
+    assert entry.snapshot is not None and not entry.incomplete
+    assert len(entry.snapshot.index.df) == 1
+
+
+def test_get_espera_antes_de_tentar_de_novo(isolated, monkeypatch):
+    refresher = Refresher({CONFIG.key: CONFIG})
+    calls = []
+    monkeypatch.setattr(refresher, 'refresh_async', lambda config, force=False: calls.append(config.key))
+    now = time.time()
+    refresher._entries[CONFIG.key] = Entry(object(), (('error', 'aba faltando'),), now, now)
+
+    for _ in range(5):
+        refresher.get(CONFIG)
+    assert calls == []
+
+    refresher._entries[CONFIG.key] = Entry(object(), (('error', 'aba faltando'),), now, now - RETRY_AFTER)
+    refresher.get(CONFIG)
+    assert calls == [CONFIG.key]
+
+
+def test_historico_incompleto_baixa_so_as_abas_que_faltaram(isolated):
+    # Três meses encerrados e o mês atual: o primeiro mês falha na primeira carga
+    first = TODAY.year * 12 + TODAY.month - 4
+    names = [month_label(key // 12, key % 12 + 1) for key in range(first, first + 4)]
+    config = DashboardConfig(**{**CONFIG.__dict__, 'start_month': first % 12 + 1, 'start_year': first // 12})
+    fetched = []
+
+    class Source(sources.DataSource):
+        down = {names[0]}
+
+        def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+            fetched.append(sheet_name)
+            if sheet_name in self.down:
+                raise sources.SourceError("fora do ar")
+            month = month_map[sheet_name.split('/')[0]]
+            return sources.FetchResult(CSV.replace(f"01/{TODAY.month:02d}", f"01/{month:02d}").encode('utf-8'))
+
+    source = Source()
+    sources.set_source(source)
+    refresher = Refresher({config.key: config})
+    entry = refresher.refresh(config)
+    assert entry.incomplete and len(entry.snapshot.index.df) == 3
+
+    source.down = set()
+    fetched.clear()
+    disk = loader.LOAD_STATS['disco']
+    entry = refresher.refresh(config)
+    assert not entry.incomplete and len(entry.snapshot.index.df) == 4
+    # A aba que faltou e as abas em aberto; as encerradas que carregaram não são lidas de novo
+    assert sorted(fetched) == sorted([names[0], *(name for name in names if not cache.is_closed(name))])
+    assert loader.LOAD_STATS['disco'] == disk
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from engine import shared, snapshot
+from engine.schema import ROW_KEY, TAB_KEY, apply_schema
+from engine.snapshot import Snapshot
+
+SETEMBRO = 2026 * 12 + 8
+OUTUBRO = 2026 * 12 + 9
+
+
+def bets(rows):
+    df = pd.DataFrame(rows, columns=['Data', 'Mercado', 'Resultado', 'L/P', TAB_KEY, ROW_KEY])
+    df['Data'] = pd.to_datetime(df['Data'])
+    df['Saldo'] = df['L/P'].cumsum()
+    return apply_schema(df)
+
+
+def test_snapshot_publicado_e_aberto_sem_ser_refeito(isolated, monkeypatch):
+    history = Snapshot.build(bets([
+        ('2026-09-01', 'Over', 'Ganha', 1.0, SETEMBRO, 0),
+        ('2026-09-02', 'Under', 'Perdida', -1.0, SETEMBRO, 1),
+    ]))
+    # Categorias diferentes nas duas partes
+    recent = bets([('2026-10-01', 'Escanteios', 'Ganha', 2.0, OUTUBRO, 0)])
+    published = Snapshot.extend(history, recent)
+    assert shared.publish('broker', published, [('warning', 'aviso')])
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("o snapshot publicado não deve ser refeito")
+
+    monkeypatch.setattr(snapshot, 'monthly_summary', rebuild)
+    monkeypatch.setattr(snapshot, 'style_map', rebuild)
+    opened, mensagens = shared.open_published('broker')
+
+    assert mensagens == (('warning', 'aviso'),)
+    assert len(opened.index.pieces) == 1
+    assert opened.index.ranges == published.index.ranges
+    pd.testing.assert_frame_equal(opened.summary, published.summary)
+    pd.testing.assert_frame_equal(opened.index.df, published.index.df, check_categorical=False)
+    assert opened.index.df['Mercado'].tolist() == ['Over', 'Under', 'Escanteios']
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from engine.singleflight import SingleFlight
+
+
+class Waiters(threading.Event):
+    """Evento que avisa, por um semáforo, cada thread que começa a esperar."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Semaphore(0)
+
+    def wait(self, timeout=None):
+        self.waiting.release()
+        return super().wait(timeout)
+
+
+def run_concurrently(flight, fn, followers):
+    """Chama ``flight.do('aba', fn)`` numa thread líder e em ``followers`` threads que esperam por ela.
+
+    ``fn`` recebe o evento que libera a chamada do líder. Retorna os resultados
+    (ou as exceções) de todas as chamadas.
+    """
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def call():
+        try:
+            results.append(flight.do('aba', lambda: fn(started, release)))
+        except Exception as e:
+            results.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(5)
+    done = flight._calls['aba'].done = Waiters()
+    threads = [threading.Thread(target=call) for _ in range(followers)]
+    for t in threads:
+        t.start()
+    for _ in threads:
+        assert done.waiting.acquire(timeout=5)
+    release.set()
+    for t in [leader, *threads]:
+        t.join(5)
+    return results
+
+
+def test_chamadas_simultaneas_compartilham_o_resultado():
+    flight = SingleFlight()
+    calls = []
+
+    def slow(started, release):
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'dados'
+
+    results = run_concurrently(flight, slow, followers=3)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('dados', False), ('dados', True), ('dados', True), ('dados', True)]
+
+
+def test_excecao_chega_a_todas_as_chamadas():
+    flight = SingleFlight()
+
+    def failing(started, release):
+        started.set()
+        release.wait(5)
+        raise ValueError('falhou')
+
+    results = run_concurrently(flight, failing, followers=2)
+
+    assert [type(e) for e in results] == [ValueError] * 3
+    assert all(str(e) == 'falhou' for e in results)
+
+
+def test_chave_liberada_apos_a_chamada():
+    flight = SingleFlight()
+    with pytest.raises(KeyError):
+        flight.do('aba', lambda: {}['x'])
+    assert flight.do('aba', lambda: 1) == (1, False)
+    assert flight.do('aba', lambda: 2) == (2, False)
+    assert flight._calls == {}
@@ -0,0 +1,68 @@
+import pandas as pd
+
+from engine.schema import MONTH_CUMSUM, ROW_KEY, TAB_KEY, apply_schema
+from engine.snapshot import Snapshot
+
+AGOSTO = 2026 * 12 + 7
+SETEMBRO = 2026 * 12 + 8
+OUTUBRO = 2026 * 12 + 9
+
+
+def bets(rows):
+    df = pd.DataFrame(rows, columns=['Data', 'L/P', TAB_KEY, ROW_KEY])
+    df['Data'] = pd.to_datetime(df['Data'])
+    df['Saldo'] = df['L/P'].cumsum()
+    return apply_schema(df)
+
+
+def test_until_corta_pela_aba_e_nao_pela_data():
+    snapshot = Snapshot.build(bets([
+        ('2026-09-01', 1.0, SETEMBRO, 0),
+        ('2026-10-01', 2.0, SETEMBRO, 1),  # aba encerrada, datada no mês seguinte
+        ('2026-09-30', 4.0, OUTUBRO, 0),  # aba em aberto, datada no mês anterior
+        ('2026-10-02', 8.0, OUTUBRO, 1),
+    ]))
+    history = snapshot.until(SETEMBRO)
+    assert sorted(history.index.df['L/P']) == [1.0, 2.0]
+
+    recent = bets([('2026-09-30', 4.0, OUTUBRO, 0), ('2026-10-02', 8.0, OUTUBRO, 1)])
+    extended = Snapshot.extend(history, recent)
+    assert len(extended.index.df) == 4
+    assert extended.summary['lucro'].sum() == 15.0
+
+
+def test_until_sem_copia_quando_as_abas_formam_o_inicio():
+    snapshot = Snapshot.build(bets([
+        ('2026-09-01', 1.0, SETEMBRO, 0),
+        ('2026-09-02', 2.0, SETEMBRO, 1),
+        ('2026-10-01', 4.0, OUTUBRO, 0),
+    ]))
+    history = snapshot.until(SETEMBRO)
+    assert len(history.index.df) == 2
+    assert history.index.df[MONTH_CUMSUM].tolist() == [1.0, 3.0]
+    assert history.summary['lucro'].tolist() == [3.0]
+
+
+def test_until_sem_coluna_da_aba():
+    df = bets([('2026-09-01', 1.0, SETEMBRO, 0)]).drop(columns=[TAB_KEY])
+    assert Snapshot.build(df).until(SETEMBRO) is None
+
+
+def test_extend_nao_copia_o_historico():
+    history = Snapshot.build(bets([
+        ('2026-08-03', 1.0, AGOSTO, 0),
+        ('2026-09-01', 2.0, SETEMBRO, 0),
+        ('2026-09-02', 4.0, SETEMBRO, 1),
+    ]))
+    recent = bets([('2026-10-02', 16.0, OUTUBRO, 1), ('2026-10-01', 8.0, OUTUBRO, 0)])
+    extended = Snapshot.extend(history, recent)
+    full = Snapshot.build(pd.concat([history.index.df, recent], ignore_index=True))
+
+    assert extended.index.pieces[0] is history.index.pieces[0]
+    assert extended.index.ranges == full.index.ranges
+    pd.testing.assert_frame_equal(extended.summary, full.summary)
+    for keys in ([AGOSTO, OUTUBRO], [SETEMBRO, OUTUBRO], [OUTUBRO], [AGOSTO, SETEMBRO, OUTUBRO]):
+        pd.testing.assert_frame_equal(extended.index.select(keys), full.index.select(keys))
+
+    # O histórico da atualização seguinte volta a ser a primeira parte, sem cópia
+    assert extended.until(SETEMBRO).index.pieces[0] is history.index.pieces[0]
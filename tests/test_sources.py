@@ -0,0 +1,71 @@
+import threading
+from datetime import datetime
+
+import pytest
+import requests
+from openpyxl import Workbook
+
+from engine import sources
+from engine.cache import sheet_id_from_url
+from engine.config import BROKER, MONEYLINE
+
+
+def workbook(tmp_path):
+    path = tmp_path / 'apostas.xlsx'
+    book = Workbook()
+    sheet = book.active
+    sheet.title = 'Outubro26'
+    sheet.append(['#', 'Data', 'Lucro/Perda'])
+    sheet.append([1, datetime(2026, 10, 1), 1.5])
+    book.save(path)
+    return path
+
+
+def test_datas_no_formato_de_cada_dashboard(tmp_path):
+    source = sources.source_from_location(str(workbook(tmp_path)))
+
+    broker = source.fetch(sheet_id_from_url(BROKER.sheet_url), 'Outubro/26').content
+    moneyline = source.fetch(sheet_id_from_url(MONEYLINE.sheet_url), 'Outubro/26').content
+
+    assert broker.decode('utf-8').splitlines() == ['Nº,Data,L/P', '1,01/10,1.5']
+    assert moneyline.decode('utf-8').splitlines() == ['Nº,Data,L/P', '1,01/10/26,1.5']
+
+
+def test_sessao_com_novas_tentativas():
+    session = sources.make_session()
+    retry = session.get_adapter('https://docs.google.com').max_retries
+    assert retry.total == sources.RETRIES
+    assert retry.backoff_jitter == sources.RETRY_JITTER
+    assert set(sources.RETRY_STATUSES) <= set(retry.status_forcelist)
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / 'Maio-23.csv').write_text('Nº,Data\n1,01/05\n', encoding='utf-8')
+    server = sources.make_server(sources.DirectorySource(tmp_path), port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_servidor_local_responde_como_o_gviz(server):
+    url = sources.GvizSource(server).csv_url('planilha', 'Maio/23')
+    response = requests.get(url)
+    assert response.status_code == 200
+    assert response.text == 'Nº,Data\n1,01/05\n'
+
+    etag = response.headers['ETag']
+    assert requests.get(url, headers={'If-None-Match': etag}).status_code == 304
+    assert requests.get(url, headers={'If-None-Match': '"outro"'}).status_code == 200
+
+    assert requests.get(sources.GvizSource(server).csv_url('planilha', 'Junho/23')).status_code == 404
+    assert requests.get(f'{server}/outro/caminho').status_code == 404
+
+
+def test_gviz_source_usa_o_etag_da_carga_anterior(server):
+    source = sources.GvizSource(server)
+    first = source.fetch('planilha', 'Maio/23')
+    assert not first.not_modified
+    assert source.fetch('planilha', 'Maio/23', etag=first.etag).not_modified
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from engine import store
+from engine.schema import apply_schema
+
+SHEETS = ['Maio/23', 'Junho/23']
+
+
+def history():
+    df = pd.DataFrame({
+        'Data': pd.to_datetime(['2023-05-02', '2023-05-31', '2023-06-01']),
+        'Mercado': ['Over', None, 'Under'],
+        'L/P': [1.0, -1.0, 0.5],
+    })
+    return apply_schema(df)
+
+
+def test_gravado_e_lido_de_volta(isolated):
+    df = history()
+    store.write('broker', df, SHEETS)
+
+    read = store.read('broker', SHEETS)
+    pd.testing.assert_frame_equal(read.sort_values('Data', ignore_index=True), df, check_categorical=False)
+    only_june = store.read('broker', months=[2023 * 12 + 5])
+    assert only_june['L/P'].tolist() == [0.5]
+
+
+def test_outras_abas_ou_versao_nao_sao_lidas(isolated, monkeypatch):
+    store.write('broker', history(), SHEETS)
+    assert store.read('broker', SHEETS[:1]) is None
+
+    monkeypatch.setattr(store, 'VERSION', store.VERSION + 1)
+    assert store.read('broker', SHEETS) is None
+
+
+def test_regravado_por_inteiro(isolated):
+    store.write('broker', history(), SHEETS)
+    store.write('broker', history().iloc[:1], SHEETS[:1])
+    assert len(store.read('broker', SHEETS[:1])) == 1
+    assert [path.name for path in store.STORE_DIR.iterdir()] == ['broker']
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from engine.schema import ROW_KEY, TAB_KEY, apply_schema
+from engine.snapshot import Snapshot
+from engine.summary import period_metrics
+
+
+def bets(rows):
+    df = pd.DataFrame(rows, columns=['Data', 'L/P', 'Stake', 'Saldo', TAB_KEY, ROW_KEY])
+    df['Data'] = pd.to_datetime(df['Data'])
+    return apply_schema(df)
+
+
+def test_saldo_final_vem_da_ultima_linha_da_planilha():
+    # A última linha da aba tem uma data anterior à da penúltima
+    df = bets([
+        ('2023-12-01', 1.0, 1.0, 1.0, 2023 * 12 + 11, 0),
+        ('2023-12-20', -1.0, 1.0, 0.0, 2023 * 12 + 11, 1),
+        ('2023-12-10', 2.0, 1.0, 2.0, 2023 * 12 + 11, 2),
+    ])
+    snapshot = Snapshot.build(df)
+    assert snapshot.index.df['Saldo'].iloc[-1] == 0.0
+    assert period_metrics(snapshot.summary, [2023 * 12 + 11], False)['saldo'] == 2.0
+
+
+def test_saldo_final_ignora_saldos_vazios():
+    df = bets([
+        ('2023-12-01', 1.0, 1.0, 1.0, 2023 * 12 + 11, 0),
+        ('2023-12-02', 1.0, 1.0, None, 2023 * 12 + 11, 1),
+    ])
+    assert Snapshot.build(df).summary['saldo_final'].iloc[0] == 1.0
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.schema import apply_schema
+from engine.table import page, page_count, search, sort
+
+
+@pytest.fixture
+def bets():
+    df = pd.DataFrame({
+        'Nº': [2, 1, 1, 3, None],
+        'Entrada': ['Flamengo x Vasco', 'Santos x Grêmio', 'Vasco x Bahia', None, 'Palmeiras x Inter'],
+        'Mercado': ['Over gols', 'Under gols', 'Escanteios', 'Over gols', None],
+        'Data': pd.to_datetime(['2025-01-02', '2025-01-01', '2025-02-01', '2025-01-02', '2025-02-03']),
+        'L/P': [0.9, -1.0, np.nan, 2.5, 0.1],
+    })
+    return apply_schema(df)
+
+
+def test_busca_em_entrada_e_mercado(bets):
+    assert search(bets, 'vasco').tolist() == [0, 2]
+    assert search(bets, ' OVER ').tolist() == [0, 3]
+    assert search(bets, 'corinthians').tolist() == []
+    assert search(bets, '  ').tolist() == [0, 1, 2, 3, 4]
+
+
+def test_ordem_por_lucro(bets):
+    positions = np.arange(len(bets))
+    assert sort(bets, positions, 'L/P').tolist() == [3, 0, 4, 1, 2]
+    # Crescente: apostas sem L/P primeiro
+    assert sort(bets, positions, 'L/P', descending=False).tolist() == [2, 1, 4, 0, 3]
+
+
+def test_ordem_por_numero_dentro_de_cada_mes(bets):
+    positions = np.arange(len(bets))
+    assert sort(bets, positions, 'Nº', descending=False).tolist() == [1, 0, 3, 4, 2]
+    assert sort(bets, np.array([0, 2, 3]), 'Nº').tolist() == [2, 3, 0]
+
+
+def test_ordem_por_data(bets):
+    assert sort(bets, np.arange(len(bets)), 'Data').tolist() == [4, 2, 3, 0, 1]
+
+
+@pytest.mark.parametrize('total, page_size, pages', [(0, 25, 1), (1, 25, 1), (25, 25, 1), (26, 25, 2), (250, 50, 5)])
+def test_quantidade_de_paginas(total, page_size, pages):
+    assert page_count(total, page_size) == pages
+
+
+def test_ultima_pagina(bets):
+    positions = np.array([4, 3, 2, 1, 0])
+    assert page(bets, positions, 1, 2).index.tolist() == [4, 3]
+    assert page(bets, positions, 3, 2).index.tolist() == [0]
+    assert page(bets, positions, page_count(len(positions), 2), 2).index.tolist() == [0]
+    assert page(bets, positions, 1, 250).index.tolist() == [4, 3, 2, 1, 0]
@@ -0,0 +1,56 @@
+from collections import Counter
+from datetime import date
+
+from engine import loader, sources
+from engine.config import BROKER
+from engine.months import month_label
+
+TODAY = date.today()
+SHEET = month_label(TODAY.year, TODAY.month)
+CSV = ("Nº,Entrada,País,Mercado,Stake,Data,Odd,Resultado,L/P,Saldo\n"
+       "1,Jogo 1,Brasil,Over,1,01/{month:02d},\"1,9\",Ganha,\"0,9\",\"0,9\"\n").format(month=TODAY.month)
+
+
+class VersionedSource(sources.DataSource):
+    """Responde "não mudou" ao ETag atual, se ``etags``; senão, sempre devolve o CSV."""
+
+    def __init__(self, etags):
+        self.etags = etags
+        self.requests = []
+
+    def fetch(self, sheet_id, sheet_name, timeout=None, etag=None, last_modified=None):
+        self.requests.append(etag)
+        if self.etags and etag == '"v1"':
+            return sources.FetchResult(None, etag)
+        return sources.FetchResult(CSV.encode('utf-8'), '"v1"' if self.etags else None)
+
+
+def load_twice(source, monkeypatch):
+    sources.set_source(source)
+    parsed = []
+    parse_tab = loader.parse_tab
+    monkeypatch.setattr(loader, 'parse_tab', lambda df, *args: parsed.append(len(df)) or parse_tab(df, *args))
+
+    first, _, status = loader.load_tab(BROKER, SHEET)
+    assert status == 'baixada'
+    second, mensagens, status = loader.load_tab(BROKER, SHEET)
+    assert (status, mensagens, parsed) == ('inalterada', [], [1])
+    assert second is first
+
+
+def test_etag_igual_nao_converte_de_novo(isolated, monkeypatch):
+    source = VersionedSource(etags=True)
+    load_twice(source, monkeypatch)
+    assert source.requests == [None, '"v1"']
+
+
+def test_csv_igual_nao_converte_de_novo(isolated, monkeypatch):
+    load_twice(VersionedSource(etags=False), monkeypatch)
+
+
+def test_load_stats_conta_as_origens(isolated):
+    sources.set_source(VersionedSource(etags=True))
+    before = loader.LOAD_STATS.copy()
+    loader.load_all_sheets(BROKER, [SHEET])
+    loader.load_all_sheets(BROKER, [SHEET])
+    assert loader.LOAD_STATS - before == Counter({'baixada': 1, 'inalterada': 1})